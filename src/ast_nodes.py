@@ -1,110 +1,172 @@
 # ============================
 #   AST NODES
 # ============================
+# Alle Knoten haben __slots__: große Literal-Tabellen erzeugen Millionen
+# Knoten, ein __dict__ pro Knoten würde den Speicherbedarf vervielfachen.
 
 
 class Program:
+    __slots__ = ("functions",)
+
     def __init__(self, functions):
         self.functions = functions
 
 
 class FunctionDef:
+    __slots__ = ("name", "params", "body", "frame_size", "slot_names")
+
     def __init__(self, name, params, body):
         self.name = name
         self.params = params
         self.body = body
 
+        # vom Resolver gesetzt
+        self.frame_size = None
+        self.slot_names = None
+
 
 class Block:
+    __slots__ = ("statements",)
+
     def __init__(self, statements):
         self.statements = statements
 
 
 class ConstDecl:
+    __slots__ = ("name", "type", "value", "slot")
+
     def __init__(self, name, type_, value):
         self.name = name
         self.type = type_
         self.value = value
+        self.slot = None
 
 
 class Call:
+    __slots__ = ("func", "args", "target")
+
     def __init__(self, func, args):
         self.func = func
         self.args = args
 
+        # aufgerufene FunctionDef, beim Linken vom Resolver gesetzt
+        self.target = None
+
 
 class StringLiteral:
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
 
 class Variable:
+    __slots__ = ("name", "slot")
+
     def __init__(self, name):
         self.name = name
+        self.slot = None
 
 
 class VarDecl:
+    __slots__ = ("name", "type", "value", "slot")
+
     def __init__(self, name, type_, value):
         self.name = name
         self.type = type_
         self.value = value
+        self.slot = None
 
 
 class Assignment:
+    __slots__ = ("name", "value", "slot")
+
     def __init__(self, name, value):
         self.name = name
         self.value = value
+        self.slot = None
 
 
 class Type:
+    __slots__ = ("name",)
+
     def __init__(self, name):
         self.name = name
 
 
 class ArrayType:
+    __slots__ = ("inner",)
+
     def __init__(self, inner):
         self.inner = inner
 
 
 class VectorType:
+    __slots__ = ("inner",)
+
     def __init__(self, inner):
         self.inner = inner
 
 
 class DictType:
+    __slots__ = ("key_type", "value_type")
+
     def __init__(self, key_type, value_type):
         self.key_type = key_type
         self.value_type = value_type
 
 
 class IntLiteral:
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
 
 class FloatLiteral:
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
 
 class ArrayLiteral:
+    __slots__ = ("elements", "element_type", "frozen")
+
     def __init__(self, elements):
         self.elements = elements
 
+        # vom Typprüfer gesetzt: numerischer Elementtyp für gepackte Ablage
+        self.element_type = None
+
+        # beim Auflösen gesetzt: fertiger, geteilter Wert (siehe frozen.py)
+        self.frozen = None
+
 
 class DictLiteral:
+    __slots__ = ("entries", "frozen")
+
     def __init__(self, entries):
         self.entries = entries
 
+        # beim Auflösen gesetzt: fertiger, geteilter Wert (siehe frozen.py)
+        self.frozen = None
+
 
 class Append:
+    __slots__ = ("target", "value", "slot")
+
     def __init__(self, target, value):
         self.target = target
         self.value = value
+        self.slot = None
 
 
 class DictSet:
+    __slots__ = ("target", "key", "value", "slot")
+
     def __init__(self, target, key, value):
         self.target = target
         self.key = key
         self.value = value
+        self.slot = None
@@ -0,0 +1,137 @@
+# ============================
+#   STAPELBETRIEB
+# ============================
+# Für "de.py <dateien oder muster>... stapel": führt viele .de-Dateien auf
+# einem ProcessPoolExecutor aus. Die Worker starten einmal und haben
+# Tokenizer, Parser und Engines schon geladen; jede Datei zahlt danach nur
+# noch ihre eigene Arbeit, nicht den Start von CPython.
+#
+# Ausgabe und Status werden pro Datei eingesammelt und in Eingabereihenfolge
+# gemeldet, die Durchsatzstatistik geht nach stderr.
+
+
+import glob
+import io
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+# schon im Elternprozess laden: die Worker erben sie (fork) bzw. laden sie in
+# _warm_up, bevor die erste Datei kommt
+import evaluator  # noqa: F401
+import parser  # noqa: F401
+import tokenizer  # noqa: F401
+from de import run_file
+from output import BufferedSink
+
+
+def expand_paths(patterns):
+    # Muster wie "skripte/**/*.de" selbst auflösen, auch ohne Shell
+    paths = []
+    seen = set()
+
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+
+        for path in matches:
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+
+    return paths
+
+
+def _warm_up():
+    # bei spawn statt fork: Module einmal pro Worker laden
+    import closures  # noqa: F401
+    import transpiler  # noqa: F401
+    import vm  # noqa: F401
+
+
+def run_one(filename, engine, level, use_cache):
+    # läuft im Worker; Ergebnis muss picklebar sein
+    buffer = io.BytesIO()
+    output = BufferedSink(buffer, "exit")
+    status = 0
+    error = ""
+
+    start = time.perf_counter()
+    try:
+        run_file(filename, output, engine, level, use_cache)
+    except Exception:
+        # wie de.py laufen: Traceback auf stderr, Status 1
+        status = 1
+        error = traceback.format_exc()
+    finally:
+        output.flush()
+
+    return status, buffer.getvalue(), error, time.perf_counter() - start
+
+
+def run_batch(patterns, engine="baum", level=0, use_cache=True, jobs=None):
+    paths = expand_paths(patterns)
+
+    if not paths:
+        print("Keine Dateien gefunden.", file=sys.stderr)
+        return 1
+
+    # ohne --jobs ein Worker pro Kern
+    jobs = jobs or os.cpu_count() or 1
+    jobs = min(jobs, len(paths))
+
+    # kleine Skripte gebündelt verschicken, aber genug Pakete für alle Worker
+    chunksize = max(1, len(paths) // (jobs * 8))
+
+    out = sys.stdout.buffer
+    sys.stdout.flush()
+
+    failed = 0
+    output_bytes = 0
+    durations = []
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_warm_up) as pool:
+        results = pool.map(
+            run_one,
+            paths,
+            [engine] * len(paths),
+            [level] * len(paths),
+            [use_cache] * len(paths),
+            chunksize=chunksize,
+        )
+
+        for path, (status, data, error, seconds) in zip(paths, results):
+            out.write(f"==> {path} (Status {status}, {seconds * 1000:.1f} ms) <==\n".encode("utf-8"))
+            out.write(data)
+
+            if error:
+                out.flush()
+                sys.stderr.write(f"==> {path} <==\n{error}")
+
+            failed += status != 0
+            output_bytes += len(data)
+            durations.append(seconds)
+
+    out.flush()
+    wall = time.perf_counter() - start
+
+    print_statistics(len(paths), failed, output_bytes, durations, wall, jobs, file=sys.stderr)
+    return 1 if failed else 0
+
+
+def print_statistics(count, failed, output_bytes, durations, wall, jobs, file):
+    durations = sorted(durations)
+    median = durations[len(durations) // 2]
+
+    print("", file=file)
+    print("=== Stapel ===", file=file)
+    print(f"  Dateien      {count} ({count - failed} ok, {failed} fehlgeschlagen), {jobs} Worker", file=file)
+    print(f"  Wanduhr      {wall * 1000:.1f} ms, {count / wall:.1f} Dateien/s", file=file)
+    print(f"  pro Datei    Median {median * 1000:.2f} ms, Max {durations[-1] * 1000:.2f} ms", file=file)
+    print(f"  Arbeitszeit  {sum(durations) * 1000:.1f} ms in den Workern", file=file)
+    print(f"  Ausgabe      {output_bytes} Bytes", file=file)
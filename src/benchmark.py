@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# ============================
+#   BENCHMARK
+# ============================
+# Vergleicht die Ausführungsmaschinen auf einem synthetischen Programm.
+#
+#   python benchmark.py [groesse] [wiederholungen]
+
+
+import contextlib
+import io
+import sys
+import time
+
+from de import ENGINES, load_program
+from generator import generate_program
+
+
+def time_engine(engine, program, repeat):
+    start = time.perf_counter()
+    instance = engine(program)
+    setup = time.perf_counter() - start
+
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            instance.run()
+            best = min(best, time.perf_counter() - start)
+
+    return setup, best
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    # dasselbe Programm wie in benchmark_suite.py, aus generator.py
+    program = load_program(generate_program(size))
+    statements = sum(len(fn.body.statements) for fn in program.functions)
+
+    print(f"{statements} Anweisungen, Lauf = bestes von {repeat} Läufen von run():")
+
+    baseline = None
+    for name, engine in ENGINES.items():
+        setup, seconds = time_engine(engine, program, repeat)
+        if baseline is None:
+            baseline = seconds
+        speedup = baseline / seconds
+        print(f"  {name:<10} Aufbau {setup * 1000:9.2f} ms   Lauf {seconds * 1000:9.2f} ms   x{speedup:5.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# ============================
+#   BENCHMARK-SUITE (PHASEN)
+# ============================
+# Misst die Phasen der echten Ladewege einzeln über mehrere Programmgrößen:
+# tokenize_iter (de.load_program, profilieren, speicher), tokenize_file
+# (de.py laufen), Parser.parse_program, Auflösung und Evaluator.run. Das
+# Ergebnis wird als JSON gespeichert; mit --compare=alt.json werden die Zeiten
+# gegen einen früheren Lauf gestellt.
+#
+#   python benchmark_suite.py [--sizes=1000,10000] [--repeat=3] [--json=datei]
+#                             [--compare=alt.json]
+
+
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from de import parse_options, positive_int
+from evaluator import Evaluator
+from generator import generate_program
+from output import BufferedSink
+from parser import Parser
+from tokenizer import tokenize_file, tokenize_iter
+
+DEFAULT_SIZES = (1000, 10000, 50000)
+PHASES = ("tokenize_iter", "tokenize_file", "parse", "resolve", "run")
+
+OPTIONS = ("sizes", "repeat", "json", "compare")
+USAGE = "Benutzung: benchmark_suite.py [--sizes=1000,10000] [--repeat=3] [--json=datei] [--compare=alt.json]"
+
+
+def measure(size, repeat):
+    source = generate_program(size)
+    best = dict.fromkeys(PHASES, float("inf"))
+
+    # tokenize_file liest wie "de.py laufen" aus einer Datei
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".de", delete=False) as f:
+        f.write(source)
+        path = f.name
+
+    try:
+        for _ in range(repeat):
+            times, token_count, program = measure_once(source, path)
+            for phase in PHASES:
+                best[phase] = min(best[phase], times[phase])
+    finally:
+        os.unlink(path)
+
+    return {
+        "size": size,
+        "bytes": len(source.encode("utf-8")),
+        "tokens": token_count,
+        "functions": len(program.functions),
+        "statements": sum(len(fn.body.statements) for fn in program.functions),
+        "seconds": best,
+    }
+
+
+def measure_once(source, path):
+    # jeder Durchlauf mit frischen Objekten; der GC läuft wie im Betrieb,
+    # nur Reste des vorigen Durchlaufs werden vorher weggeräumt
+    gc.collect()
+    times = {}
+
+    # beide Tokenizer als Liste gemessen, getrennt vom Parser; im Betrieb
+    # zieht der Parser die Tokens lazy aus denselben Generatoren
+    with open(path, "r", encoding="utf-8") as f:
+        start = time.perf_counter()
+        tokens = list(tokenize_file(f))
+        times["tokenize_file"] = time.perf_counter() - start
+    del tokens
+    gc.collect()
+
+    start = time.perf_counter()
+    tokens = list(tokenize_iter(source, normalize_strings=True))
+    times["tokenize_iter"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    program = Parser(tokens, source).parse_program()
+    times["parse"] = time.perf_counter() - start
+
+    with open(os.devnull, "wb") as devnull:
+        output = BufferedSink(devnull)
+
+        # Typprüfung und Slot-Vergabe laufen im Konstruktor
+        start = time.perf_counter()
+        evaluator = Evaluator(program, output=output)
+        times["resolve"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        evaluator.run()
+        output.flush()
+        times["run"] = time.perf_counter() - start
+
+    return times, len(tokens), program
+
+
+def current_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, old):
+    old_by_size = {entry["size"]: entry for entry in old["results"]}
+
+    print(f"Vergleich mit {old.get('commit') or 'unbekannt'} (>1 = langsamer als vorher):")
+    for entry in results:
+        previous = old_by_size.get(entry["size"])
+        if previous is None:
+            continue
+
+        ratios = []
+        for phase in PHASES:
+            before = previous["seconds"].get(phase)
+            if before:
+                ratios.append(f"{phase} x{entry['seconds'][phase] / before:5.2f}")
+        print(f"  {entry['size']:>8}  " + "  ".join(ratios))
+
+        # Durchsatz des Parsers, bei gleicher Eingabe direkt vergleichbar
+        if previous["seconds"].get("parse"):
+            rate_before = previous["tokens"] / previous["seconds"]["parse"]
+            rate = entry["tokens"] / entry["seconds"]["parse"]
+            print(f"  {'':>8}  Parser {rate_before:,.0f} → {rate:,.0f} Tokens/s")
+
+
+def main():
+    args, options = parse_options(sys.argv[1:])
+
+    # unbekannte Optionen (auch --help) nicht stillschweigend übergehen:
+    # sonst startet ein minutenlanger Lauf mit den Standardwerten
+    unknown = [f"--{name}" for name in options if name not in OPTIONS] + args
+    if unknown:
+        print(f"Unbekannte Option: {unknown[0]}")
+        print(USAGE)
+        sys.exit(1)
+
+    sizes = DEFAULT_SIZES
+    if "sizes" in options:
+        sizes = tuple(positive_int(s, "Ungültige Größe") for s in options["sizes"].split(","))
+    repeat = positive_int(options.get("repeat", "3"), "Ungültige Anzahl Durchläufe")
+
+    results = []
+    print(f"Bestes von {repeat} Durchläufen, Zeiten in ms:")
+    print(f"  {'Größe':>8} {'Tokens':>9}" + "".join(f" {phase:>13}" for phase in PHASES) + f" {'Parser Tok/s':>13}")
+
+    for size in sizes:
+        entry = measure(size, repeat)
+        results.append(entry)
+        print(
+            f"  {size:>8} {entry['tokens']:>9}"
+            + "".join(f" {entry['seconds'][phase] * 1000:13.2f}" for phase in PHASES)
+            + f" {entry['tokens'] / entry['seconds']['parse']:13,.0f}"
+        )
+
+    report = {
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": repeat,
+        "results": results,
+    }
+
+    if "json" in options:
+        with open(options["json"], "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Ergebnis gespeichert in {options['json']}")
+
+    if "compare" in options:
+        with open(options["compare"], "r", encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# ============================
+#   PROGRAM CACHE (.pyc für .de)
+# ============================
+# Der geparste Programmbaum wird neben der Quelldatei in __decache__/
+# abgelegt. Schlüssel sind der Hash des Quelltexts und die
+# Interpreter-Version; passt eins davon nicht, wird neu geparst.
+
+
+import contextlib
+import gc
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+
+from parser import Parser
+from tokenizer import tokenize_file
+
+CACHE_DIR = "__decache__"
+MAGIC = b"DECACHE1"
+
+# Quelldateien werden in Stücken dieser Größe gehasht
+HASH_CHUNK_SIZE = 1 << 20
+
+# Dateien, deren Änderung das Format des gespeicherten Programms ändert
+_FRONTEND_FILES = ("ast_nodes.py", "parser.py", "tokenizer.py", "cache.py")
+
+
+def _interpreter_version():
+    digest = hashlib.sha256(f"{sys.version_info[0]}.{sys.version_info[1]}".encode())
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    for name in _FRONTEND_FILES:
+        with open(os.path.join(here, name), "rb") as f:
+            digest.update(f.read())
+
+    return digest.digest()
+
+
+INTERPRETER_VERSION = _interpreter_version()
+
+
+def cache_path(filename):
+    directory, name = os.path.split(os.path.abspath(filename))
+    return os.path.join(directory, CACHE_DIR, name + ".cache")
+
+
+# -------------------------
+#   LOAD
+# -------------------------
+# Vertrauensgrenze: die Cache-Datei wird mit pickle geladen, und pickle kann
+# beim Laden beliebigen Code ausführen. Geladen wird deshalb nur eine Datei,
+# die demselben Benutzer gehört wie die Quelldatei und die weder Gruppe noch
+# andere schreiben dürfen; alles andere gilt als ungültiger Cache. Wer die
+# Quelldatei ändern darf, kann ohnehin bestimmen, was ausgeführt wird.
+
+
+def load_cached(filename, parse=None):
+    # parse: Quelltext → Program für den Fall ohne gültigen Cache, z. B.
+    # parallel.parse_parallel; sonst stückweise wie de.load_file
+    source_hash, source_stat = _hash_file(filename)
+    path = cache_path(filename)
+
+    program = _read(path, source_hash, source_stat)
+    if program is not None:
+        return program
+
+    # kein oder ungültiger Cache: neu parsen
+    if parse is not None:
+        program = parse(_read_source(filename))
+    else:
+        with open(filename, "r", encoding="utf-8") as f:
+            program = Parser(tokenize_file(f), lambda: _read_source(filename)).parse_program()
+
+    # hat sich die Datei seit dem Hashen geändert, passt der Hash nicht zum
+    # geparsten Programm
+    if _changed(filename, source_stat):
+        return program
+
+    _write(path, source_hash, program)
+    return program
+
+
+def _hash_file(filename):
+    digest = hashlib.sha256()
+
+    with open(filename, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+        return digest.digest(), os.fstat(f.fileno())
+
+
+def _changed(filename, source_stat):
+    try:
+        current = os.stat(filename)
+    except OSError:
+        return True
+    return (current.st_size, current.st_mtime_ns) != (source_stat.st_size, source_stat.st_mtime_ns)
+
+
+def _read_source(filename):
+    with open(filename, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _trusted(cache_stat, source_stat):
+    return cache_stat.st_uid == source_stat.st_uid and not cache_stat.st_mode & 0o022
+
+
+def _read(path, source_hash, source_stat):
+    header = MAGIC + INTERPRETER_VERSION + source_hash
+
+    try:
+        with open(path, "rb") as f:
+            # Besitzer und Rechte der geöffneten Datei, nicht des Pfads
+            if not _trusted(os.fstat(f.fileno()), source_stat):
+                return None
+            if f.read(len(header)) != header:
+                return None
+            payload = f.read()
+    except OSError:
+        return None
+
+    try:
+        # der Baum hat keine Zyklen; die GC-Läufe während des Ladens
+        # kosten sonst ein Vielfaches der eigentlichen Arbeit
+        with gc_paused():
+            return pickle.loads(payload)
+    except Exception:
+        return None
+
+
+def _write(path, source_hash, program):
+    directory = os.path.dirname(path)
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+
+        with gc_paused():
+            payload = pickle.dumps(program, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # erst in eine temporäre Datei, dann atomar ersetzen: parallele
+        # Läufe sehen nie eine halb geschriebene Cache-Datei
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(MAGIC + INTERPRETER_VERSION + source_hash)
+                f.write(payload)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except (OSError, RecursionError, pickle.PicklingError):
+        # Cache ist optional, z. B. bei schreibgeschütztem Verzeichnis
+        pass
+
+
+@contextlib.contextmanager
+def gc_paused():
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
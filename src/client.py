@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# ============================
+#   CLIENT
+# ============================
+# Dünner Ersatz für "de.py <datei.de> laufen": schickt die Datei an den
+# laufenden daemon.py und gibt dessen Ausgabe ungepuffert weiter.
+# Importiert nichts vom Interpreter, der Start kostet nur CPython selbst.
+#
+#   python client.py <datei.de> [laufen] [--engine=...] [-O1] [--socket=pfad]
+#   python client.py --stop
+
+
+import json
+import os
+import socket
+import sys
+
+from protocol import ERROR, OUTPUT, STATUS, default_socket_path, foreign_socket, read_frames
+
+
+def main():
+    args = []
+    options = {}
+
+    # wie de.parse_options, hier kopiert, um de.py nicht zu laden
+    for arg in sys.argv[1:]:
+        if arg.startswith("--"):
+            name, _, value = arg[2:].partition("=")
+            options[name] = value
+        elif arg.startswith("-O"):
+            options["O"] = arg[2:]
+        else:
+            args.append(arg)
+
+    if "stop" in options:
+        request = {"command": "stop"}
+    elif args and args[1:] in ([], ["laufen"]):
+        level = options.get("O", "0")
+        if level not in ("0", "1"):
+            print(f"Unbekannte Optimierungsstufe: -O{level}")
+            sys.exit(1)
+
+        request = {
+            "path": os.path.abspath(args[0]),
+            "engine": options.get("engine", "baum"),
+            "level": int(level),
+        }
+    else:
+        print("Benutzung: client.py <datei.de> [laufen] [--engine=...] [-O0|-O1] [--socket=pfad] | --stop")
+        sys.exit(1)
+
+    path = options.get("socket") or default_socket_path()
+    problem = foreign_socket(path)
+    if problem:
+        print(f"Verbinde nicht: {problem}", file=sys.stderr)
+        sys.exit(2)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError as e:
+        print(f"Kein Daemon erreichbar: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+
+    out = sys.stdout.buffer
+    status = 1
+    for kind, payload in read_frames(sock):
+        if kind == OUTPUT:
+            out.write(payload)
+            out.flush()
+        elif kind == ERROR:
+            sys.stderr.write(payload.decode("utf-8"))
+        elif kind == STATUS:
+            status = int(payload)
+
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+# ============================
+#   CLOSURE COMPILER
+# ============================
+# Jede Funktion wird einmal in eine Liste spezialisierter Python-Closures
+# übersetzt. Beim Ausführen gibt es danach keine isinstance-Abfragen mehr.
+
+
+import ast_nodes
+from evaluator import Evaluator
+from frozen import FROZEN_TYPES, thaw
+from typecheck import SEQUENCE_TYPES, TypedArray
+
+
+class ClosureEvaluator(Evaluator):
+    def __init__(self, program: ast_nodes.Program, output=None):
+        super().__init__(program, output)
+
+        # Aufrufe halten einen Verweis auf diese Zelle; gefüllt wird sie erst,
+        # wenn alle Funktionen übersetzt sind (Aufrufe vor der Definition)
+        self.bodies = {name: [None] for name in self.functions}
+
+        self.compiled = {}
+        for name, fn in self.functions.items():
+            self.compiled[name] = self.bodies[name][0] = self.compile_block(fn.body)
+
+    # -------------------------
+    #   FUNCTION
+    # -------------------------
+    def eval_function(self, fn: ast_nodes.FunctionDef):
+        self.call_function(self.frames[fn], self.compiled[fn.name])
+
+    def call_function(self, frame, body):
+        # Frame-Pool wie im Evaluator
+        env, empty = frame
+        old_env = self.env
+        self.env = env
+
+        try:
+            for stmt in body:
+                stmt(env)
+        finally:
+            env[:] = empty
+            self.env = old_env
+
+    # -------------------------
+    #   BLOCK
+    # -------------------------
+    def compile_block(self, block: ast_nodes.Block):
+        return tuple(self.compile_statement(stmt) for stmt in block.statements)
+
+    # -------------------------
+    #   STATEMENTS
+    # -------------------------
+    def compile_statement(self, stmt):
+        if isinstance(stmt, (ast_nodes.ConstDecl, ast_nodes.VarDecl, ast_nodes.Assignment)):
+            return self.compile_store(stmt.slot, stmt.value)
+
+        if isinstance(stmt, ast_nodes.Call):
+            return self.compile_call(stmt)
+
+        if isinstance(stmt, ast_nodes.Append):
+            return self.compile_append(stmt)
+
+        if isinstance(stmt, ast_nodes.DictSet):
+            return self.compile_dict_set(stmt)
+
+        raise Exception(f"Unbekannte Anweisung: {stmt}")
+
+    def compile_store(self, slot, expr):
+        value = self.compile_expression(expr)
+
+        def store(env):
+            env[slot] = value(env)
+
+        return store
+
+    def compile_append(self, stmt: ast_nodes.Append):
+        target = stmt.target
+        slot = stmt.slot
+        value = self.compile_expression(stmt.value)
+
+        def append(env):
+            container = env[slot]
+            item = value(env)
+
+            if not isinstance(container, SEQUENCE_TYPES):
+                raise Exception(f"Kann nicht zu {target} hinzufügen: kein Vektor/Array")
+
+            # geteiltes Literal: erst beim ersten Verändern kopieren
+            if type(container) in FROZEN_TYPES:
+                container = env[slot] = thaw(container)
+
+            container.append(item)
+
+        return append
+
+    def compile_dict_set(self, stmt: ast_nodes.DictSet):
+        target = stmt.target
+        slot = stmt.slot
+        key = self.compile_expression(stmt.key)
+        value = self.compile_expression(stmt.value)
+
+        def dict_set(env):
+            container = env[slot]
+            k = key(env)
+            v = value(env)
+
+            if not isinstance(container, dict):
+                raise Exception(f"Kann keinen Schlüssel in {target} setzen: kein Wörterbuch")
+
+            if type(container) in FROZEN_TYPES:
+                container = env[slot] = thaw(container)
+
+            container[k] = v
+
+        return dict_set
+
+    # -------------------------
+    #   CALL
+    # -------------------------
+    def compile_call(self, call: ast_nodes.Call):
+        func = call.func
+
+        if func == "ausgeben":
+            args = tuple(self.compile_expression(a) for a in call.args)
+            write = self.output.write
+
+            if len(args) == 1:
+                (arg,) = args
+
+                def ausgeben(env):
+                    write(arg(env))
+
+                return ausgeben
+
+            def ausgeben_n(env):
+                write([a(env) for a in args][0])
+
+            return ausgeben_n
+
+        target = call.target
+        if target is not None:
+            body = self.bodies[target.name]
+            frame = self.frames[target]
+            call_function = self.call_function
+
+            def call_user(env):
+                call_function(frame, body[0])
+
+            return call_user
+
+        def unknown(env):
+            raise Exception(f"Unbekannte Funktion: {func}")
+
+        return unknown
+
+    # -------------------------
+    #   EXPRESSIONS
+    # -------------------------
+    def compile_expression(self, expr):
+        # literal
+        if isinstance(expr, (ast_nodes.IntLiteral, ast_nodes.FloatLiteral, ast_nodes.StringLiteral)):
+            literal = expr.value
+            return lambda env: literal
+
+        # variable reference
+        if isinstance(expr, ast_nodes.Variable):
+            slot = expr.slot
+            return lambda env: env[slot]
+
+        # fertig gebautes, geteiltes Literal (siehe frozen.py)
+        if isinstance(expr, (ast_nodes.ArrayLiteral, ast_nodes.DictLiteral)) and expr.frozen is not None:
+            frozen = expr.frozen
+            return lambda env: frozen
+
+        # array literal
+        if isinstance(expr, ast_nodes.ArrayLiteral):
+            elements = tuple(self.compile_expression(e) for e in expr.elements)
+            element_type = expr.element_type
+            if element_type is not None:
+                return lambda env: TypedArray(element_type, [e(env) for e in elements])
+            return lambda env: [e(env) for e in elements]
+
+        # dictionary literal
+        if isinstance(expr, ast_nodes.DictLiteral):
+            entries = tuple((self.compile_expression(k), self.compile_expression(v)) for (k, v) in expr.entries)
+            return lambda env: {k(env): v(env) for (k, v) in entries}
+
+        raise Exception(f"Unbekannter Ausdruck: {expr}")
@@ -0,0 +1,215 @@
+# ============================
+#   BYTECODE COMPILER
+# ============================
+
+
+import ast_nodes
+from frozen import FROZEN_TYPES
+from resolver import resolve_program
+
+# -------------------------
+#   OPCODES
+# -------------------------
+# Jede Instruktion besteht aus zwei Einträgen im Code: Opcode und Argument.
+
+LOAD_CONST = 0  # arg: Index in consts
+LOAD_FAST = 1  # arg: Slot im Frame (vom Resolver)
+STORE_FAST = 2  # arg: Slot im Frame (vom Resolver)
+BUILD_LIST = 3  # arg: Anzahl Elemente auf dem Stack
+BUILD_DICT = 4  # arg: Anzahl Schlüssel/Wert-Paare auf dem Stack
+APPEND = 5  # arg: Slot des Ziels im Frame
+DICT_SET = 6  # arg: Slot des Ziels im Frame
+CALL_BUILTIN_AUSGEBEN = 7  # arg: Anzahl Argumente auf dem Stack
+RAISE = 8  # arg: Index in consts (Fehlermeldung)
+BUILD_TYPED_ARRAY = 9  # arg: Index in consts (Elementtyp), nimmt die Liste vom Stack
+CALL_FUNCTION = 10  # arg: Index in consts (CodeObject des Ziels, beim Linken eingesetzt)
+
+OPNAMES = {
+    LOAD_CONST: "LOAD_CONST",
+    LOAD_FAST: "LOAD_FAST",
+    STORE_FAST: "STORE_FAST",
+    BUILD_LIST: "BUILD_LIST",
+    BUILD_DICT: "BUILD_DICT",
+    APPEND: "APPEND",
+    DICT_SET: "DICT_SET",
+    CALL_BUILTIN_AUSGEBEN: "CALL_BUILTIN_AUSGEBEN",
+    RAISE: "RAISE",
+    BUILD_TYPED_ARRAY: "BUILD_TYPED_ARRAY",
+    CALL_FUNCTION: "CALL_FUNCTION",
+}
+
+
+class CodeObject:
+    def __init__(self, name, code, consts, frame_size, slot_names):
+        self.name = name
+        self.code = code
+        self.consts = consts
+        self.frame_size = frame_size
+        self.slot_names = slot_names
+
+        # (Opcode, Argument)-Paare, einmal gebildet statt bei jedem Aufruf
+        self.instructions = tuple(zip(code[::2], code[1::2]))
+
+    def disassemble(self):
+        lines = [f"funktion {self.name}:"]
+        for pc in range(0, len(self.code), 2):
+            op = self.code[pc]
+            arg = self.code[pc + 1]
+            if op in (LOAD_CONST, RAISE, BUILD_TYPED_ARRAY):
+                detail = repr(self.consts[arg])
+            elif op == CALL_FUNCTION:
+                detail = self.consts[arg].name
+            elif op in (LOAD_FAST, STORE_FAST, APPEND, DICT_SET):
+                detail = self.slot_names[arg]
+            else:
+                detail = str(arg)
+            lines.append(f"    {pc:4d} {OPNAMES[op]:<22} {arg:<4} ({detail})")
+        return "\n".join(lines)
+
+
+# ============================
+#   COMPILER
+# ============================
+
+
+def compile_program(program: ast_nodes.Program):
+    resolve_program(program)
+
+    # wie im Evaluator: spätere Definitionen überschreiben frühere
+    functions = {}
+    for fn in program.functions:
+        functions[fn.name] = fn
+
+    codes = {name: FunctionCompiler(fn).compile() for name, fn in functions.items()}
+    link(codes, functions)
+    return codes
+
+
+def link(codes, functions):
+    # CALL_FUNCTION zeigt zunächst auf die FunctionDef; ersetzt durch deren
+    # CodeObject, damit die VM beim Aufruf nichts nachschlagen muss
+    by_function = {id(fn): codes[name] for name, fn in functions.items()}
+
+    for code in codes.values():
+        code.consts = tuple(by_function[id(c)] if isinstance(c, ast_nodes.FunctionDef) else c for c in code.consts)
+
+
+class FunctionCompiler:
+    def __init__(self, fn: ast_nodes.FunctionDef):
+        self.fn = fn
+        self.code = []
+        self.consts = []
+
+        # Index für schnelles Wiederfinden
+        self._const_index = {}
+
+    def compile(self):
+        for stmt in self.fn.body.statements:
+            self.compile_statement(stmt)
+
+        return CodeObject(
+            self.fn.name,
+            self.code,
+            tuple(self.consts),
+            self.fn.frame_size,
+            self.fn.slot_names,
+        )
+
+    # -------------------------
+    #   STATEMENTS
+    # -------------------------
+    def compile_statement(self, stmt):
+        # Konstanz wurde bereits vom Resolver geprüft
+        if isinstance(stmt, (ast_nodes.ConstDecl, ast_nodes.VarDecl, ast_nodes.Assignment)):
+            self.compile_expression(stmt.value)
+            self._emit(STORE_FAST, stmt.slot)
+            return
+
+        if isinstance(stmt, ast_nodes.Call):
+            self.compile_call(stmt)
+            return
+
+        # das Ziel liest die VM selbst aus dem Slot: ein geteiltes Literal
+        # wird dort vor dem ersten Verändern durch eine Kopie ersetzt
+        if isinstance(stmt, ast_nodes.Append):
+            self.compile_expression(stmt.value)
+            self._emit(APPEND, stmt.slot)
+            return
+
+        if isinstance(stmt, ast_nodes.DictSet):
+            self.compile_expression(stmt.key)
+            self.compile_expression(stmt.value)
+            self._emit(DICT_SET, stmt.slot)
+            return
+
+        raise Exception(f"Unbekannte Anweisung: {stmt}")
+
+    # -------------------------
+    #   CALL
+    # -------------------------
+    def compile_call(self, call: ast_nodes.Call):
+        if call.func == "ausgeben":
+            for arg in call.args:
+                self.compile_expression(arg)
+            self._emit(CALL_BUILTIN_AUSGEBEN, len(call.args))
+            return
+
+        if call.target is not None:
+            self._emit(CALL_FUNCTION, self._const(call.target))
+            return
+
+        # erst zur Laufzeit melden, wie im Evaluator
+        self._emit(RAISE, self._const(f"Unbekannte Funktion: {call.func}"))
+
+    # -------------------------
+    #   EXPRESSIONS
+    # -------------------------
+    def compile_expression(self, expr):
+        if isinstance(expr, (ast_nodes.IntLiteral, ast_nodes.FloatLiteral, ast_nodes.StringLiteral)):
+            self._emit(LOAD_CONST, self._const(expr.value))
+            return
+
+        if isinstance(expr, ast_nodes.Variable):
+            self._emit(LOAD_FAST, expr.slot)
+            return
+
+        # fertig gebautes, geteiltes Literal (siehe frozen.py)
+        if isinstance(expr, (ast_nodes.ArrayLiteral, ast_nodes.DictLiteral)) and expr.frozen is not None:
+            self._emit(LOAD_CONST, self._const(expr.frozen))
+            return
+
+        if isinstance(expr, ast_nodes.ArrayLiteral):
+            for element in expr.elements:
+                self.compile_expression(element)
+            self._emit(BUILD_LIST, len(expr.elements))
+            if expr.element_type is not None:
+                self._emit(BUILD_TYPED_ARRAY, self._const(expr.element_type))
+            return
+
+        if isinstance(expr, ast_nodes.DictLiteral):
+            for key, value in expr.entries:
+                self.compile_expression(key)
+                self.compile_expression(value)
+            self._emit(BUILD_DICT, len(expr.entries))
+            return
+
+        raise Exception(f"Unbekannter Ausdruck: {expr}")
+
+    # -------------------------
+    #   HELPERS
+    # -------------------------
+    def _emit(self, op, arg=0):
+        self.code.append(op)
+        self.code.append(arg)
+
+    def _const(self, value):
+        # 1 und 1.0 (und True) sind als dict-Schlüssel gleich, daher mit Typ;
+        # FunctionDefs und eingefrorene Container nach Identität
+        if isinstance(value, (ast_nodes.FunctionDef,) + FROZEN_TYPES):
+            key = (type(value), id(value))
+        else:
+            key = (type(value), value)
+        if key not in self._const_index:
+            self._const_index[key] = len(self.consts)
+            self.consts.append(value)
+        return self._const_index[key]
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# ============================
+#   DAEMON
+# ============================
+# Langlebiger Interpreter hinter einem Unix-Socket. Tokenizer, Parser und
+# Engines sind geladen, geparste und aufgelöste Programme bleiben im Speicher;
+# eine Anfrage kostet danach nur noch den Lauf selbst. client.py ersetzt
+# "de.py <datei.de> laufen".
+#
+#   python daemon.py [--socket=pfad]
+#
+# Protokoll: siehe protocol.py.
+
+
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import traceback
+
+from cache import load_cached
+from de import ENGINES, load_program, optimize, parse_options
+from output import BufferedSink
+from protocol import ERROR, OUTPUT, STATUS, default_socket_path, foreign_socket, pack_frame
+from resolver import resolve_program
+from transpiler import run_source
+
+# Schlüssel → aufgelöstes Programm
+MAX_PROGRAMS = 256
+
+
+class ProgramCache:
+    def __init__(self, max_entries=MAX_PROGRAMS):
+        self.max_entries = max_entries
+        self.programs = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, load):
+        with self.lock:
+            program = self.programs.get(key)
+        if program is not None:
+            return program
+
+        # außerhalb der Sperre laden; doppelt geladen ist nur verschwendet
+        program = resolve_program(load())
+
+        with self.lock:
+            if len(self.programs) >= self.max_entries:
+                del self.programs[next(iter(self.programs))]
+            self.programs[key] = program
+        return program
+
+
+class SocketStream:
+    # Binärstrom für BufferedSink: jeder Block wird ein Ausgabe-Rahmen
+    def __init__(self, sock):
+        self.sock = sock
+
+    def write(self, data):
+        self.sock.sendall(pack_frame(OUTPUT, data))
+
+    def flush(self):
+        pass
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+
+        if request.get("command") == "stop":
+            self.request.sendall(pack_frame(STATUS, b"0"))
+            threading.Thread(target=self.server.shutdown).start()
+            return
+
+        output = BufferedSink(SocketStream(self.request), "size")
+        status = 0
+        error = None
+
+        try:
+            self.server.run(request, output)
+        except Exception:
+            status = 1
+            error = traceback.format_exc()
+
+        # Reihenfolge wie bei de.py: erst die bisherige Ausgabe, dann der Fehler
+        output.flush()
+        if error is not None:
+            self.request.sendall(pack_frame(ERROR, error.encode("utf-8")))
+        self.request.sendall(pack_frame(STATUS, str(status).encode("ascii")))
+
+
+class Daemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        self.programs = ProgramCache()
+        super().__init__(path, RequestHandler)
+
+    def run(self, request, output):
+        engine = request.get("engine", "baum")
+        if engine not in ENGINES:
+            raise Exception(f"Unbekannte Engine: {engine}")
+        level = str(request.get("level", 0))
+        if level not in ("0", "1"):
+            raise Exception(f"Unbekannte Optimierungsstufe: -O{level}")
+        level = int(level)
+
+        if "source" in request:
+            source = request["source"]
+            key = ("source", hashlib.sha256(source.encode("utf-8")).digest(), level)
+
+            def load():
+                return optimize(load_program(source), level)
+
+        else:
+            path = request["path"]
+            # Änderungen an der Datei machen den Eintrag ungültig
+            stat = os.stat(path)
+            key = ("path", path, stat.st_mtime_ns, stat.st_size, level)
+
+            def load():
+                return optimize(load_cached(path), level)
+
+        # der Python-Engine reicht der Quelltext-Cache des Transpilers
+        if engine == "python":
+            if "source" in request:
+                source = request["source"]
+            else:
+                with open(request["path"], "r", encoding="utf-8") as f:
+                    source = f.read()
+            run_source(source, lambda _source: self.programs.get(key, load), variant=level, output=output)
+            return
+
+        # aufgelöste Programme werden nur gelesen, mehrere Threads dürfen
+        # dasselbe Programm gleichzeitig ausführen
+        ENGINES[engine](self.programs.get(key, load), output=output).run()
+
+
+def main():
+    _, options = parse_options(sys.argv[1:])
+    path = options.get("socket") or default_socket_path()
+
+    # nur den eigenen Socket prüfen oder entfernen, nie eine fremde Datei
+    problem = foreign_socket(path)
+    if problem:
+        print(f"Starte nicht: {problem}", file=sys.stderr)
+        sys.exit(1)
+
+    # verwaisten Socket eines beendeten Daemons entfernen, einen lebenden nicht
+    if os.path.lexists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+            print(f"Auf {path} läuft bereits ein Daemon.", file=sys.stderr)
+            sys.exit(1)
+        except OSError:
+            os.unlink(path)
+        finally:
+            probe.close()
+
+    # bind() legt den Socket mit den Rechten der umask an; ein chmod danach
+    # ließe ein Fenster, in dem sich andere Benutzer verbinden könnten
+    old_umask = os.umask(0o077)
+    try:
+        server = Daemon(path)
+    finally:
+        os.umask(old_umask)
+
+    with server:
+        print(f"de-Daemon lauscht auf {path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
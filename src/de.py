@@ -2,9 +2,25 @@
 import re
 import sys
 
+from cache import load_cached
+from closures import ClosureEvaluator
 from evaluator import Evaluator
+from optimizer import optimize_program
+from output import BUFFER_SIZE, FLUSH_POLICIES, PrintSink, open_sink
 from parser import Parser
-from tokenizer import Tokenizer
+from tokenizer import tokenize_file, tokenize_iter
+from transpiler import PythonEngine, run_source
+from vm import VM
+
+ENGINES = {
+    "baum": Evaluator,
+    "vm": VM,
+    "closure": ClosureEvaluator,
+    "python": PythonEngine,
+}
+
+# Optionen, die "stapel" versteht; alle anderen lehnt es ab
+BATCH_OPTIONS = ("jobs", "engine", "no-cache", "O")
 
 
 def preprocess(source: str) -> str:
@@ -23,36 +39,201 @@ def preprocess(source: str) -> str:
     return merged
 
 
-def main():
-    if len(sys.argv) < 3:
-        print("Benutzung: de.py <datei.de> laufen")
-        sys.exit(1)
+def load_program(source: str):
+    # --- tokenize (lazy, der Parser zieht die Tokens) ---
+    # ohne preprocess, damit die Positionen der Tokens auf die Zeilen des
+    # Quelltexts zeigen; Whitespace in Zeichenketten normalisiert der Tokenizer
+    tokens = tokenize_iter(source, normalize_strings=True)
 
-    filename = sys.argv[1]
-    command = sys.argv[2]
+    # --- parse ---
+    parser = Parser(tokens, source)
+    return parser.parse_program()
 
-    if command != "laufen":
-        print(f"Unbekannter Befehl: {command}")
-        sys.exit(1)
 
-    # --- read source code ---
+def load_file(filename):
+    # ohne preprocess: der Tokenizer liest die Datei stückweise und
+    # normalisiert Whitespace in Zeichenketten selbst
     with open(filename, "r", encoding="utf-8") as f:
-        source = f.read()
+        return Parser(tokenize_file(f), lambda: _read_source(filename)).parse_program()
 
-    source = preprocess(source)
 
-    # --- tokenize ---
-    tokenizer = Tokenizer(source)
-    tokens = tokenizer.tokenize()
+def _read_source(filename):
+    # nur für Fehlermeldungen: Zeile/Spalte brauchen den ganzen Text
+    with open(filename, "r", encoding="utf-8") as f:
+        return f.read()
 
-    # --- parse ---
-    parser = Parser(tokens)
-    program = parser.parse_program()
+
+def parse_options(argv):
+    args = []
+    options = {}
+
+    for arg in argv:
+        if arg.startswith("--"):
+            name, _, value = arg[2:].partition("=")
+            options[name] = value
+        elif arg.startswith("-O"):
+            # Optimierungsstufe wie bei Compilern: -O0, -O1
+            options["O"] = arg[2:]
+        else:
+            args.append(arg)
+
+    return args, options
+
+
+def optimize(program, level, show_report=False):
+    # der Optimierer arbeitet auf dem fertig geparsten Programm; im
+    # __decache__/ liegt weiterhin der unoptimierte Baum
+    report = optimize_program(program, level)
+    if show_report:
+        for line in report:
+            print(f"-O{level}: {line}", file=sys.stderr)
+    return program
+
+
+def run_file(filename, output, engine="baum", level=0, use_cache=True, show_report=False, parse_jobs=0):
+    # parse_jobs: 0 = seriell parsen, None = ein Prozess pro Kern, n = n Prozesse
+    def optimized(program):
+        return optimize(program, level, show_report)
+
+    parse = None
+    if parse_jobs != 0:
+        from parallel import parse_parallel
+
+        def parse(source):
+            return parse_parallel(source, parse_jobs)
+
+    # Python-Codeobjekte werden pro Quelltext zwischengespeichert
+    if engine == "python":
+        with open(filename, "r", encoding="utf-8") as f:
+            source = f.read()
+
+        if use_cache:
+            run_source(source, lambda _source: optimized(load_cached(filename, parse)), variant=level, output=output)
+        else:
+            run_source(source, lambda source: optimized((parse or load_program)(source)), variant=level, output=output)
+        return
+
+    # geparstes Programm aus __decache__/, falls der Quelltext unverändert ist
+    if use_cache:
+        program = load_cached(filename, parse)
+    elif parse is not None:
+        program = parse(_read_source(filename))
+    else:
+        program = load_file(filename)
+
+    program = optimized(program)
 
     # --- evaluate ---
-    evaluator = Evaluator(program)
+    evaluator = ENGINES[engine](program, output=output)
     evaluator.run()
 
 
+def check_options(options):
+    engine = options.get("engine", "baum")
+    if engine not in ENGINES:
+        print(f"Unbekannte Engine: {engine}")
+        sys.exit(1)
+
+    level = options.get("O", "0")
+    if level not in ("0", "1"):
+        print(f"Unbekannte Optimierungsstufe: -O{level}")
+        sys.exit(1)
+
+    flush = options.get("flush")
+    if flush is not None and flush not in FLUSH_POLICIES:
+        print(f"Unbekannte Flush-Strategie: {flush}")
+        sys.exit(1)
+
+    buffer_size = positive_int(options.get("buffer", str(BUFFER_SIZE)), "Ungültige Puffergröße")
+
+    return engine, int(level), flush, buffer_size
+
+
+def positive_int(value, message):
+    # Zahl > 0 aus einer Option, sonst Meldung und Abbruch wie oben
+    if not (value.isascii() and value.isdigit()) or int(value) == 0:
+        print(f"{message}: {value}")
+        sys.exit(1)
+    return int(value)
+
+
+def main():
+    args, options = parse_options(sys.argv[1:])
+
+    # stapel: beliebig viele Dateien oder Muster vor dem Befehl
+    if len(args) >= 2 and args[-1] == "stapel":
+        # Ausgabe und Bericht sammelt batch.py selbst ein
+        unsupported = [name for name in options if name not in BATCH_OPTIONS]
+        if unsupported:
+            print(f"Im Stapelbetrieb nicht unterstützt: --{unsupported[0]}")
+            sys.exit(1)
+
+        engine, level, _, _ = check_options(options)
+        jobs = positive_int(options["jobs"], "Ungültige Anzahl Worker") if "jobs" in options else None
+
+        from batch import run_batch
+
+        sys.exit(run_batch(args[:-1], engine, level, "no-cache" not in options, jobs))
+
+    if len(args) < 2:
+        print(
+            "Benutzung: de.py <datei.de> laufen|profilieren|speicher [--engine=baum|vm|closure|python] [--no-cache]"
+            " [-O0|-O1] [--opt-report] [--output=datei] [--flush=size|line|exit] [--buffer=bytes] [--pstats=datei]"
+            " [--parse-jobs[=n]]"
+        )
+        print("           de.py <dateien oder muster>... stapel [--jobs=n] [--engine=...] [--no-cache] [-O0|-O1]")
+        sys.exit(1)
+
+    filename = args[0]
+    command = args[1]
+
+    if command not in ("laufen", "profilieren", "speicher"):
+        print(f"Unbekannter Befehl: {command}")
+        sys.exit(1)
+
+    engine, level, flush, buffer_size = check_options(options)
+    use_cache = "no-cache" not in options
+    show_report = "opt-report" in options
+
+    # --parse-jobs ohne Wert: ein Prozess pro Kern
+    parse_jobs = 0
+    if "parse-jobs" in options:
+        parse_jobs = None
+        if options["parse-jobs"]:
+            parse_jobs = positive_int(options["parse-jobs"], "Ungültige Anzahl Parse-Prozesse")
+
+    def optimized(program):
+        return optimize(program, level, show_report)
+
+    # --- output ---
+    # gepuffert als Bytes direkt auf stdout oder in eine Datei;
+    # "--output=-" behält das bisherige print()
+    path = options.get("output")
+    if path == "-":
+        output = PrintSink()
+    else:
+        output = open_sink(path, flush, buffer_size)
+
+    try:
+        # profilieren: einzeln gemessene Phasen, immer auf dem Baum-Evaluator
+        if command == "profilieren":
+            from profiler import profile_file
+
+            profile_file(filename, output, optimized if level else None, options.get("pstats"))
+            return
+
+        # speicher: tracemalloc pro Stufe, ebenfalls auf dem Baum-Evaluator
+        if command == "speicher":
+            from memory import measure_file
+
+            measure_file(filename, output, optimized if level else None)
+            return
+
+        run_file(filename, output, engine, level, use_cache, show_report, parse_jobs)
+    finally:
+        # auch bei Fehlern: bis dahin Ausgegebenes landet vollständig
+        output.close()
+
+
 if __name__ == "__main__":
     main()
@@ -1,12 +1,28 @@
 import ast_nodes
+from frozen import FROZEN_TYPES, thaw
+from output import PrintSink
+from resolver import call_depth_message, resolve_program
+from typecheck import SEQUENCE_TYPES, TypedArray
 
 
 class Evaluator:
-    def __init__(self, program: ast_nodes.Program):
+    def __init__(self, program: ast_nodes.Program, output=None):
         self.program = program
         self.functions = {}
-        self.env = {}
-        self.constants = set()
+
+        # Ziel für ausgeben, siehe output.py
+        self.output = output if output is not None else PrintSink()
+
+        # Frame der laufenden Funktion: eine Liste mit einem Slot pro Name
+        self.env = []
+
+        # Slots zuweisen und Konstanten prüfen
+        resolve_program(program)
+
+        # Frame-Pool dieser Instanz: ein Frame pro Funktion, dazu ein Tupel
+        # zum Leeren. Rekursion lehnt der Resolver ab, also ist jede Funktion
+        # höchstens einmal gleichzeitig aktiv und ein Frame genügt.
+        self.frames = {fn: ([None] * fn.frame_size, (None,) * fn.frame_size) for fn in program.functions}
 
         # Funktionen einsammeln
         for fn in program.functions:
@@ -19,18 +35,26 @@ class Evaluator:
         if "losgehen" not in self.functions:
             raise Exception("Keine Funktion 'losgehen' gefunden.")
 
-        self.eval_function(self.functions["losgehen"])
+        try:
+            self.eval_function(self.functions["losgehen"])
+        except RecursionError:
+            raise Exception(call_depth_message()) from None
 
     # -------------------------
     #   FUNCTION
     # -------------------------
     def eval_function(self, fn: ast_nodes.FunctionDef):
+        env, empty = self.frames[fn]
         old_env = self.env
-        self.env = {}
-
-        self.eval_block(fn.body)
+        self.env = env
 
-        self.env = old_env
+        try:
+            self.eval_block(fn.body)
+        finally:
+            # geleert zurück in den Pool: der Frame hält keine Werte über
+            # den Aufruf hinaus am Leben, auch nicht nach einer Ausnahme
+            env[:] = empty
+            self.env = old_env
 
     # -------------------------
     #   BLOCK
@@ -43,21 +67,10 @@ class Evaluator:
     #   STATEMENTS
     # -------------------------
     def eval_statement(self, stmt):
-        if isinstance(stmt, ast_nodes.ConstDecl):
-            value = self.eval_expression(stmt.value)
-            self.env[stmt.name] = value
-            self.constants.add(stmt.name)
-            return
-
-        if isinstance(stmt, ast_nodes.VarDecl):
-            value = self.eval_expression(stmt.value)
-            self.env[stmt.name] = value
-            return
-
-        if isinstance(stmt, ast_nodes.Assignment):
-            # self.eval_assignment(stmt)
+        # Konstanz wurde bereits vom Resolver geprüft
+        if isinstance(stmt, (ast_nodes.ConstDecl, ast_nodes.VarDecl, ast_nodes.Assignment)):
             value = self.eval_expression(stmt.value)
-            self.env[stmt.name] = value
+            self.env[stmt.slot] = value
             return
 
         if isinstance(stmt, ast_nodes.Call):
@@ -65,23 +78,30 @@ class Evaluator:
             return
 
         if isinstance(stmt, ast_nodes.Append):
-            container = self.env[stmt.target]
+            container = self.env[stmt.slot]
             value = self.eval_expression(stmt.value)
 
-            if not isinstance(container, list):
+            if not isinstance(container, SEQUENCE_TYPES):
                 raise Exception(f"Kann nicht zu {stmt.target} hinzufügen: kein Vektor/Array")
 
+            # geteiltes Literal: erst beim ersten Verändern kopieren
+            if type(container) in FROZEN_TYPES:
+                container = self.env[stmt.slot] = thaw(container)
+
             container.append(value)
             return
 
         if isinstance(stmt, ast_nodes.DictSet):
-            container = self.env[stmt.target]
+            container = self.env[stmt.slot]
             key = self.eval_expression(stmt.key)
             value = self.eval_expression(stmt.value)
 
             if not isinstance(container, dict):
                 raise Exception(f"Kann keinen Schlüssel in {stmt.target} setzen: kein Wörterbuch")
 
+            if type(container) in FROZEN_TYPES:
+                container = self.env[stmt.slot] = thaw(container)
+
             container[key] = value
             return
 
@@ -93,7 +113,12 @@ class Evaluator:
     def eval_call(self, call: ast_nodes.Call):
         if call.func == "ausgeben":
             args = [self.eval_expression(a) for a in call.args]
-            print(args[0])
+            self.output.write(args[0])
+            return
+
+        # Ziel wurde beim Linken gesetzt
+        if call.target is not None:
+            self.eval_function(call.target)
             return
 
         raise Exception(f"Unbekannte Funktion: {call.func}")
@@ -116,25 +141,21 @@ class Evaluator:
 
         # variable reference
         if isinstance(expr, ast_nodes.Variable):
-            return self.env[expr.name]
+            return self.env[expr.slot]
 
         # array literal
         if isinstance(expr, ast_nodes.ArrayLiteral):
-            return [self.eval_expression(e) for e in expr.elements]
+            if expr.frozen is not None:
+                return expr.frozen
+            elements = [self.eval_expression(e) for e in expr.elements]
+            if expr.element_type is not None:
+                return TypedArray(expr.element_type, elements)
+            return elements
 
         # dictionary literal
         if isinstance(expr, ast_nodes.DictLiteral):
+            if expr.frozen is not None:
+                return expr.frozen
             return {self.eval_expression(k): self.eval_expression(v) for (k, v) in expr.entries}
 
         raise Exception(f"Unbekannter Ausdruck: {expr}")
-
-    # -------------------------
-    #   ASSIGNMENT
-    # -------------------------
-    def eval_assignment(self, node: ast_nodes.Assignment):
-        name = node.name
-        if name in self.constants:
-            raise Exception(f"Konstante '{name}' kann nicht geändert werden.")
-        if name not in self.env:
-            raise Exception(f"Variable '{name}' ist nicht definiert.")
-        self.env[name] = self.eval_expression(node.value)
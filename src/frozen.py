@@ -0,0 +1,217 @@
+# ============================
+#   EINGEFRORENE LITERALE
+# ============================
+# Array- und Wörterbuch-Literale, die nur aus Literalen bestehen, werden beim
+# Auflösen einmal gebaut und danach bei jeder Ausführung geteilt, statt
+# Element für Element neu zu entstehen.
+#
+# Die Sprache hat weder Indizierung noch Parameter oder Rückgabewerte: ein
+# Container kann nur über einen Namen seiner Funktion verändert werden
+# (hinzufügen/setzen), verschachtelte Container nie. Pro Funktion gilt daher:
+#   - verschachtelte Literale und Aufrufargumente: immer teilen
+#   - gebunden an einen Namen, dessen Wert nie verändert wird: teilen
+#   - verändert, aber ohne Alias: teilen, Kopie erst beim ersten
+#     hinzufügen/setzen (copy-on-write, siehe thaw)
+#   - verändert und mit Alias (auch als Element eines anderen Containers):
+#     wie bisher bei jeder Ausführung neu bauen, sonst sähe der Alias die
+#     Änderung nicht
+# Container als Wörterbuch-Schlüssel werden nie eingefroren, damit der
+# Fehler "unhashable type: ..." denselben Typ nennt wie ohne Einfrieren
+# ('list', 'dict' bzw. 'TypedArray' bei numerischen Arrays).
+#
+# Die eingefrorenen Typen sind Unterklassen von list/dict/TypedArray und
+# werden genauso ausgegeben.
+
+
+import ast_nodes
+from typecheck import TypedArray
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError("eingefrorener Container kann nicht verändert werden")
+
+
+class FrozenList(list):
+    __slots__ = ()
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+
+    # copy und pickle füllen eine leere Instanz sonst per extend/__setitem__;
+    # der Inhalt ist bis in die Tiefe eingefroren, teilen genügt wie bei tuple
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce_ex__(self, protocol):
+        return type(self), (list(self),)
+
+
+class FrozenDict(dict):
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = update = setdefault = pop = popitem = clear = _readonly
+    __ior__ = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce_ex__(self, protocol):
+        return type(self), (dict(self),)
+
+
+class FrozenTypedArray(TypedArray):
+    # __copy__, __deepcopy__ und __reduce_ex__ erbt sie von TypedArray
+    __slots__ = ()
+
+    append = extend = insert = pop = remove = frombytes = fromlist = _readonly
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+
+
+FROZEN_TYPES = (FrozenList, FrozenDict, FrozenTypedArray)
+
+
+def thaw(value):
+    # veränderbare flache Kopie; Elemente bleiben geteilt, sie werden nie verändert
+    if type(value) is FrozenList:
+        return list(value)
+    if type(value) is FrozenDict:
+        return dict(value)
+    if type(value) is FrozenTypedArray:
+        copy = TypedArray(value.element_type)
+        copy.frombytes(value.tobytes())
+        return copy
+    return value
+
+
+# ============================
+#   ANALYSE
+# ============================
+
+
+def freeze_function(fn: ast_nodes.FunctionDef):
+    statements = fn.body.statements
+
+    # Namen, die über "a ist b" denselben Container halten können
+    aliases = _AliasSets()
+    mutated = set()
+
+    # Namen, deren Wert in einem anderen Container landet
+    escaped = set()
+
+    for stmt in statements:
+        if isinstance(stmt, (ast_nodes.ConstDecl, ast_nodes.VarDecl, ast_nodes.Assignment)):
+            aliases.add(stmt.name)
+            if isinstance(stmt.value, ast_nodes.Variable):
+                aliases.union(stmt.name, stmt.value.name)
+            else:
+                _collect_names(stmt.value, escaped)
+        elif isinstance(stmt, ast_nodes.Append):
+            mutated.add(stmt.target)
+            _collect_names(stmt.value, escaped)
+        elif isinstance(stmt, ast_nodes.DictSet):
+            mutated.add(stmt.target)
+            _collect_names(stmt.key, escaped)
+            _collect_names(stmt.value, escaped)
+
+    mutated_sets = {aliases.find(name) for name in mutated}
+    escaped_sets = {aliases.find(name) for name in escaped}
+
+    for stmt in statements:
+        if isinstance(stmt, (ast_nodes.ConstDecl, ast_nodes.VarDecl, ast_nodes.Assignment)):
+            root = aliases.find(stmt.name)
+            shared = root not in mutated_sets or (aliases.size(root) == 1 and root not in escaped_sets)
+            _freeze_expression(stmt.value, shared)
+        elif isinstance(stmt, ast_nodes.Call):
+            for arg in stmt.args:
+                _freeze_expression(arg, True)
+        elif isinstance(stmt, ast_nodes.Append):
+            _freeze_expression(stmt.value, True)
+        elif isinstance(stmt, ast_nodes.DictSet):
+            _freeze_expression(stmt.key, False)
+            _freeze_expression(stmt.value, True)
+
+
+def _collect_names(expr, names):
+    if isinstance(expr, ast_nodes.Variable):
+        names.add(expr.name)
+    elif isinstance(expr, ast_nodes.ArrayLiteral):
+        for element in expr.elements:
+            _collect_names(element, names)
+    elif isinstance(expr, ast_nodes.DictLiteral):
+        for key, value in expr.entries:
+            _collect_names(key, names)
+            _collect_names(value, names)
+
+
+def _freeze_expression(expr, shared):
+    # shared: darf der äußerste Container geteilt werden? Innere immer.
+    if isinstance(expr, ast_nodes.ArrayLiteral):
+        for element in expr.elements:
+            _freeze_expression(element, True)
+    elif isinstance(expr, ast_nodes.DictLiteral):
+        for key, value in expr.entries:
+            _freeze_expression(key, False)
+            _freeze_expression(value, True)
+    else:
+        return
+
+    expr.frozen = _build(expr) if shared else None
+
+
+def _build(expr):
+    # None, wenn nicht alles Literale sind oder der Bau scheitert; dann
+    # meldet die Ausführung den Fehler wie bisher
+    values = []
+    parts = expr.elements if isinstance(expr, ast_nodes.ArrayLiteral) else [x for kv in expr.entries for x in kv]
+
+    for part in parts:
+        if isinstance(part, (ast_nodes.IntLiteral, ast_nodes.FloatLiteral, ast_nodes.StringLiteral)):
+            values.append(part.value)
+        elif isinstance(part, (ast_nodes.ArrayLiteral, ast_nodes.DictLiteral)) and part.frozen is not None:
+            values.append(part.frozen)
+        else:
+            return None
+
+    try:
+        if isinstance(expr, ast_nodes.DictLiteral):
+            return FrozenDict(zip(values[::2], values[1::2]))
+        if expr.element_type is not None:
+            return FrozenTypedArray(expr.element_type, values)
+        return FrozenList(values)
+    except Exception:
+        return None
+
+
+class _AliasSets:
+    # Union-Find über Namen
+    def __init__(self):
+        self.parent = {}
+        self.sizes = {}
+
+    def add(self, name):
+        if name not in self.parent:
+            self.parent[name] = name
+            self.sizes[name] = 1
+
+    def find(self, name):
+        self.add(name)
+        while self.parent[name] != name:
+            self.parent[name] = self.parent[self.parent[name]]
+            name = self.parent[name]
+        return name
+
+    def union(self, a, b):
+        a = self.find(a)
+        b = self.find(b)
+        if a != b:
+            self.parent[b] = a
+            self.sizes[a] += self.sizes.pop(b)
+
+    def size(self, root):
+        return self.sizes[root]
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# ============================
+#   PROGRAMMGENERATOR
+# ============================
+# Erzeugt synthetische, gültige .de-Programme beliebiger Größe für Benchmarks:
+# viele Funktionen, große Array-/Wörterbuch-Tabellen, lange Folgen von
+# hinzufügen/setzen und viele ausgeben.
+#
+#   python generator.py <groesse> [datei.de]
+
+
+import sys
+
+
+def generate_program(size, functions=None, table_size=None):
+    # size skaliert alles linear; functions/table_size überschreiben einzeln
+    functions = functions if functions is not None else max(1, size // 50)
+    table_size = table_size if table_size is not None else size
+
+    lines = []
+
+    # Hilfsfunktionen, jede wird aus losgehen einmal aufgerufen
+    for f in range(functions):
+        lines.extend(_helper_function(f))
+
+    lines.extend(_main_function(size, table_size, functions))
+    return "\n".join(lines) + "\n"
+
+
+def _helper_function(index):
+    name = f"hilfe_{index}"
+    return [
+        f"funktion {name}:",
+        f'    konstante Zeichenkette name ist "{name}".',
+        f"    variable Zahl32 zähler ist {index}.",
+        f"    zähler ist {index + 1}.",
+        f"    variable Vektorvon Zahl32 werte ist [{index}, {index + 1}, {index + 2}].",
+        f"    In werte {index} hinzufügen.",
+        '    variable Wörterbuchvon Schlüssel Zeichenkette zu Wert Zahl32 karte ist {"a" : 1}.',
+        f'    In karte wird "b" {index} sein.',
+        "    name ausgeben.",
+        "    werte ausgeben.",
+        f"funktionsende {name}",
+        "",
+    ]
+
+
+def _main_function(size, table_size, functions):
+    lines = ["funktion losgehen:"]
+
+    for f in range(functions):
+        lines.append(f"    hilfe_{f}.")
+
+    # große Literal-Tabellen; ", " und " : " mit Leerzeichen, sonst wird
+    # "1,2" als Fließkommazahl gelesen
+    numbers = ", ".join(str(i % 65536) for i in range(table_size))
+    lines.append(f"    konstante Arrayvon Ganzzahl32 zahlen ist [{numbers}].")
+
+    entries = ", ".join(f'{i} : "Eintrag {i}"' for i in range(table_size))
+    lines.append(f"    variable Wörterbuchvon Schlüssel Ganzzahl32 zu Wert Zeichenkette tabelle ist {{{entries}}}.")
+
+    words = ", ".join(f'"wort{i}"' for i in range(min(table_size, 1000)))
+    lines.append(f"    variable Vektorvon Zeichenkette wörter ist [{words}].")
+
+    # lange Folgen von hinzufügen/setzen
+    lines.append("    variable Vektorvon Ganzzahl32 vektor ist [].")
+    for i in range(size):
+        lines.append(f"    In vektor {i % 65536} hinzufügen.")
+
+    for i in range(size):
+        lines.append(f'    In tabelle wird {i} "neu {i}" sein.')
+
+    # viel Ausgabe
+    for i in range(size):
+        lines.append(f'    variable Zeichenkette zeile_{i} ist "Zeile {i}".')
+        lines.append(f"    zeile_{i} ausgeben.")
+
+    lines.append("    vektor ausgeben.")
+    lines.append("    zahlen ausgeben.")
+    lines.append("funktionsende losgehen")
+    return lines
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Benutzung: generator.py <groesse> [datei.de]")
+        sys.exit(1)
+
+    source = generate_program(int(sys.argv[1]))
+
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], "w", encoding="utf-8") as f:
+            f.write(source)
+    else:
+        sys.stdout.write(source)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# ============================
+#   INCREMENTAL PARSING
+# ============================
+# Der Quelltext wird an den Funktionsenden ("funktionsende NAME") in
+# Stücke zerlegt. Nach einer Änderung werden nur die Stücke neu
+# tokenisiert und geparst, die die Änderung berührt; alle anderen
+# FunctionDef-Knoten werden unverändert übernommen.
+
+
+import re
+from bisect import bisect_left
+
+import ast_nodes
+from parser import Parser
+from tokenizer import tokenize_iter
+
+# Zeichenketten werden mitgelesen, damit ein "funktionsende x" in einem
+# String nicht als Grenze zählt
+BOUNDARY_PATTERN = re.compile(r'"[^"]*"|\bfunktionsende\s+[^\W\d]\w*')
+
+
+def function_boundaries(source, pos=0):
+    # Endpositionen aller "funktionsende NAME" ab pos
+    for match in BOUNDARY_PATTERN.finditer(source, pos):
+        if match.group()[0] != '"':
+            yield match.end()
+
+
+def split_functions(source):
+    # (start, end)-Paare, die den Quelltext lückenlos abdecken; das letzte
+    # Stück enthält den Rest nach dem letzten Funktionsende
+    spans = []
+    start = 0
+
+    for end in function_boundaries(source):
+        spans.append((start, end))
+        start = end
+
+    if start < len(source):
+        spans.append((start, len(source)))
+
+    return spans
+
+
+def parse_chunk(source, start, end):
+    # wie de.load_file: Whitespace in Zeichenketten wird normalisiert;
+    # Positionen in Fehlermeldungen beziehen sich auf den ganzen Quelltext
+    text = source[start:end]
+    if not text.strip():
+        return []
+    tokens = tokenize_iter(text, normalize_strings=True, base=start, source=source)
+    return Parser(tokens, source).parse_program().functions
+
+
+class IncrementalParser:
+    def __init__(self, source):
+        self.source = source
+
+        # ends[i] ist das Ende von Stück i, Stück i beginnt bei ends[i - 1]
+        self.ends = []
+        self.chunks = []
+
+        for start, end in split_functions(source):
+            self.ends.append(end)
+            self.chunks.append(parse_chunk(source, start, end))
+
+        self.program = self._build_program()
+        self.reparsed = len(self.chunks)
+
+    # -------------------------
+    #   EDIT
+    # -------------------------
+    def apply_edit(self, start, end, text):
+        # ersetzt source[start:end] durch text und liefert das neue Program;
+        # bei einem Fehler bleibt der alte Zustand erhalten
+        source = self.source[:start] + text + self.source[end:]
+        delta = len(text) - (end - start)
+
+        # erstes Stück, dessen Ende die Änderung erreicht (inklusive: ein
+        # Einfügen direkt hinter "funktionsende NAME" verlängert den Namen)
+        first = bisect_left(self.ends, start)
+        scan_from = self.ends[first - 1] if first > 0 else 0
+
+        new_ends = []
+        new_chunks = []
+        resume = len(self.ends)
+        chunk_start = scan_from
+
+        for boundary in function_boundaries(source, scan_from):
+            new_ends.append(boundary)
+            new_chunks.append(parse_chunk(source, chunk_start, boundary))
+            chunk_start = boundary
+
+            # hinter der Änderung auf eine alte Grenze getroffen: ab hier ist
+            # der Text identisch und wird genauso zerlegt
+            if boundary >= start + len(text):
+                old = boundary - delta
+                index = bisect_left(self.ends, old, first)
+                if index < len(self.ends) and self.ends[index] == old:
+                    resume = index + 1
+                    break
+        else:
+            if chunk_start < len(source):
+                new_ends.append(len(source))
+                new_chunks.append(parse_chunk(source, chunk_start, len(source)))
+
+        self.source = source
+        self.ends[first:] = new_ends + [e + delta for e in self.ends[resume:]]
+        self.chunks[first:] = new_chunks + self.chunks[resume:]
+        self.program = self._build_program()
+        self.reparsed = len(new_chunks)
+
+        return self.program
+
+    def _build_program(self):
+        return ast_nodes.Program([fn for chunk in self.chunks for fn in chunk])
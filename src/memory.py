@@ -0,0 +1,162 @@
+# ============================
+#   SPEICHERANALYSE
+# ============================
+# Für "de.py <datei.de> speicher": misst mit tracemalloc Spitze und
+# verbleibenden Speicher jeder Stufe (Quelltext, Tokenliste, AST, Laufzeit)
+# und meldet am Ende jeder Funktion die tief gemessen größten Container
+# (Vektorvon, Arrayvon, Wörterbuchvon) im Frame.
+#
+# Der Bericht geht nach stderr, die Ausgabe des Programms bleibt auf stdout.
+# tracemalloc verlangsamt alles deutlich; die Zahlen sind Bytes von Python-
+# Allokationen, nicht der RSS des Prozesses.
+
+
+import sys
+import tracemalloc
+
+import ast_nodes
+from evaluator import Evaluator
+from parser import Parser
+from tokenizer import tokenize_iter
+from typecheck import SEQUENCE_TYPES
+
+# so viele Container pro Funktion melden
+TOP_CONTAINERS = 5
+
+CONTAINER_NAMES = {
+    ast_nodes.ArrayType: "Arrayvon",
+    ast_nodes.VectorType: "Vektorvon",
+    ast_nodes.DictType: "Wörterbuchvon",
+}
+
+
+class MemoryEvaluator(Evaluator):
+    def __init__(self, program: ast_nodes.Program, output=None):
+        super().__init__(program, output)
+
+        # (Funktion, [(Bytes, Name, Typ, Länge), ...]) in Ende-Reihenfolge
+        self.container_reports = []
+
+        # jeder Block ist ein Funktionsrumpf
+        self.owners = {id(fn.body): fn for fn in self.functions.values()}
+
+        # Slot → deklarierter Containertyp, für den Bericht
+        self.slot_types = {id(fn.body): declared_containers(fn) for fn in self.functions.values()}
+
+    def eval_block(self, block: ast_nodes.Block):
+        super().eval_block(block)
+
+        # der Frame ist hier noch vollständig, eval_function gibt ihn erst danach frei
+        fn = self.owners[id(block)]
+        slot_types = self.slot_types[id(block)]
+        self.container_reports.append((fn.name, largest_containers(self.env, fn.slot_names, slot_types)))
+
+
+def declared_containers(fn: ast_nodes.FunctionDef):
+    # nur das Schlüsselwort (Arrayvon, Vektorvon, Wörterbuchvon), nicht die
+    # internen Klassen (TypedArray, FrozenList, ...), die der Nutzer nie sieht
+    found = {}
+    for stmt in fn.body.statements:
+        if isinstance(stmt, (ast_nodes.ConstDecl, ast_nodes.VarDecl)):
+            name = CONTAINER_NAMES.get(type(stmt.type))
+            if name is not None:
+                found[stmt.slot] = name
+    return found
+
+
+def largest_containers(env, slot_names, slot_types, limit=TOP_CONTAINERS):
+    found = []
+
+    for slot, value in enumerate(env):
+        if isinstance(value, SEQUENCE_TYPES + (dict,)):
+            type_name = slot_types.get(slot) or ("dict" if isinstance(value, dict) else "list")
+            found.append((deep_size(value), slot_names[slot], type_name, len(value)))
+
+    found.sort(reverse=True)
+    return found[:limit]
+
+
+def deep_size(value, seen=None):
+    # geteilte Objekte (Aliasse, interned Strings) nur einmal zählen
+    if seen is None:
+        seen = set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+
+    # TypedArray: Werte liegen gepackt im Puffer, getsizeof enthält ihn
+    if isinstance(value, list):
+        size += sum(deep_size(item, seen) for item in value)
+    elif isinstance(value, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in value.items())
+
+    return size
+
+
+# ============================
+#   ABLAUF
+# ============================
+
+
+def measure_file(filename, output, optimize=None):
+    # optimize: Programm → Programm (z. B. der -O1-Durchlauf) oder None
+    stages = []
+
+    def stage(name, fn, *args):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        try:
+            return fn(*args)
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            stages.append((name, peak - before, current - before))
+
+    def read_source():
+        with open(filename, "r", encoding="utf-8") as f:
+            return f.read()
+
+    tracemalloc.start()
+    evaluator = None
+    try:
+        # wie de.load_program: ohne preprocess, Fehler zeigen Zeile und Spalte
+        source = stage("Quelltext", read_source)
+        tokens = stage("Tokens", lambda: list(tokenize_iter(source, normalize_strings=True)))
+        program = stage("AST", lambda: Parser(tokens, source).parse_program())
+        if optimize is not None:
+            program = stage("Optimierung", optimize, program)
+
+        evaluator = stage("Auflösung", MemoryEvaluator, program, output)
+        stage("Laufzeit", evaluator.run)
+    finally:
+        tracemalloc.stop()
+        output.flush()
+        print_report(stages, evaluator, file=sys.stderr)
+
+
+def print_report(stages, evaluator, file):
+    print("", file=file)
+    print("=== Speicher pro Stufe (tracemalloc) ===", file=file)
+    print(f"  {'Stufe':<12} {'Spitze':>12} {'verbleibend':>12}", file=file)
+    for name, peak, retained in stages:
+        print(f"  {name:<12} {_format(peak):>12} {_format(retained):>12}", file=file)
+
+    if evaluator is None:
+        return
+
+    print(f"=== Größte Container am Funktionsende (tief, Top {TOP_CONTAINERS}) ===", file=file)
+    for fn_name, containers in evaluator.container_reports:
+        print(f"  {fn_name}:", file=file)
+        if not containers:
+            print("    (keine)", file=file)
+        for size, name, type_name, length in containers:
+            print(f"    {name:<24} {type_name:<13} {length:>10} Elemente {_format(size):>12}", file=file)
+
+
+def _format(size):
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
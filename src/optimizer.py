@@ -0,0 +1,227 @@
+# ============================
+#   OPTIMIZER
+# ============================
+# Läuft zwischen Parser und Ausführung (-O1):
+#   - Konstanten mit Literalwert werden in ihre Verwendungen eingesetzt
+#   - Container-Konstanten mit genau einer Verwendung als Argument werden
+#     dorthin verschoben
+#   - Deklarationen und Zuweisungen, die nie gelesen werden, fallen weg
+# Jede Änderung wird im Bericht vermerkt.
+
+
+import ast_nodes
+from resolver import FunctionResolver
+from typecheck import FunctionChecker
+
+SCALAR_LITERALS = (ast_nodes.IntLiteral, ast_nodes.FloatLiteral, ast_nodes.StringLiteral)
+CONTAINER_LITERALS = (ast_nodes.ArrayLiteral, ast_nodes.DictLiteral)
+BINDINGS = (ast_nodes.ConstDecl, ast_nodes.VarDecl, ast_nodes.Assignment)
+
+
+def optimize_program(program: ast_nodes.Program, level=1):
+    report = []
+
+    if level >= 1:
+        for fn in program.functions:
+            FunctionOptimizer(fn, report).optimize()
+
+    return report
+
+
+class FunctionOptimizer:
+    def __init__(self, fn: ast_nodes.FunctionDef, report):
+        self.fn = fn
+        self.report = report
+        self.removed = []
+
+        # verschobene Container-Konstanten: ihre leere Deklaration fällt
+        # danach weg, gemeldet ist sie schon als verschoben
+        self.moved = set()
+
+    def optimize(self):
+        # erst genauso prüfen wie ohne Optimierung, damit -O1 keine Fehler
+        # verschluckt (z. B. eine geänderte Konstante, die danach wegfiele)
+        FunctionChecker(self.fn).check()
+        FunctionResolver(self.fn).resolve()
+
+        self.fold_constants()
+        self.inline_single_use_containers()
+        self.remove_dead_bindings()
+
+        # Slots passen nicht mehr: der Resolver läuft in der Engine erneut
+        self.fn.frame_size = None
+        self.fn.slot_names = None
+
+    # -------------------------
+    #   CONSTANT FOLDING
+    # -------------------------
+    def fold_constants(self):
+        # ohne Kontrollfluss und mit geprüfter Konstanz sieht jeder Lesezugriff
+        # nach der Deklaration genau diesen Wert
+        constants = {}
+        uses = {}
+
+        def fold(expr):
+            if isinstance(expr, ast_nodes.Variable) and expr.name in constants:
+                uses[expr.name] += 1
+                return _copy_literal(constants[expr.name])
+            return expr
+
+        for stmt in self.fn.body.statements:
+            _rewrite_reads(stmt, fold)
+
+            if isinstance(stmt, ast_nodes.ConstDecl) and isinstance(stmt.value, SCALAR_LITERALS):
+                constants[stmt.name] = stmt.value
+                uses[stmt.name] = 0
+
+        for name, count in uses.items():
+            if count:
+                self.report.append(f"{self.fn.name}: Konstante '{name}' an {count} Stelle(n) eingesetzt")
+
+    def inline_single_use_containers(self):
+        statements = self.fn.body.statements
+        reads = _count_reads(statements)
+
+        for index, stmt in enumerate(statements):
+            if not isinstance(stmt, ast_nodes.ConstDecl) or not isinstance(stmt.value, CONTAINER_LITERALS):
+                continue
+            if reads.get(stmt.name) != 1 or not _is_literal_container(stmt.value):
+                continue
+
+            # die einzige Verwendung muss ein Aufrufargument sein; jede andere
+            # (Zuweisung, Element, Ziel von hinzufügen) teilt das Objekt.
+            # Nur reine Literale: Variablen darin könnten inzwischen neu
+            # gebunden sein.
+            for later in statements[index + 1 :]:
+                if isinstance(later, ast_nodes.Call) and any(_is_read_of(a, stmt.name) for a in later.args):
+                    later.args = [stmt.value if _is_read_of(a, stmt.name) else a for a in later.args]
+                    reads[stmt.name] = 0
+                    self.moved.add(id(stmt))
+                    self.report.append(f"{self.fn.name}: Konstante '{stmt.name}' in ihre einzige Verwendung verschoben")
+                    break
+
+    # -------------------------
+    #   DEAD BINDINGS
+    # -------------------------
+    def remove_dead_bindings(self):
+        statements = self.fn.body.statements
+        reads = _count_reads(statements)
+
+        # rückwärts: eine entfernte Bindung liest meist nur frühere Namen,
+        # die so im selben Durchlauf ebenfalls tot werden können
+        while True:
+            kept = []
+            newly_dead = False
+
+            for stmt in reversed(statements):
+                if isinstance(stmt, BINDINGS) and not reads.get(stmt.name) and _is_pure(stmt.value):
+                    if id(stmt) not in self.moved:
+                        kind = "Zuweisung an" if isinstance(stmt, ast_nodes.Assignment) else "Deklaration"
+                        self.removed.append(f"{self.fn.name}: {kind} '{stmt.name}' entfernt (wird nie gelesen)")
+
+                    for name in _variables(stmt.value):
+                        reads[name] -= 1
+                        newly_dead = newly_dead or not reads[name]
+                    continue
+
+                kept.append(stmt)
+
+            kept.reverse()
+            statements = kept
+
+            if not newly_dead:
+                break
+
+        self.fn.body.statements = statements
+        # Meldungen in Quelltext-Reihenfolge
+        self.report.extend(reversed(self.removed))
+
+
+# ============================
+#   HELPERS
+# ============================
+
+
+def _copy_literal(literal):
+    return type(literal)(literal.value)
+
+
+def _is_read_of(expr, name):
+    return isinstance(expr, ast_nodes.Variable) and expr.name == name
+
+
+def _is_pure(expr):
+    # kann weder scheitern noch etwas verändern
+    if isinstance(expr, (ast_nodes.Variable,) + SCALAR_LITERALS):
+        return True
+    return _is_literal_container(expr)
+
+
+def _is_literal_container(expr):
+    if isinstance(expr, ast_nodes.ArrayLiteral):
+        return all(isinstance(e, SCALAR_LITERALS) or _is_literal_container(e) for e in expr.elements)
+    if isinstance(expr, ast_nodes.DictLiteral):
+        # Container als Schlüssel scheitern zur Laufzeit (unhashable), wie in
+        # frozen._freeze_expression(key, False); solche Literale bleiben stehen
+        return all(
+            isinstance(k, SCALAR_LITERALS) and (isinstance(v, SCALAR_LITERALS) or _is_literal_container(v))
+            for k, v in expr.entries
+        )
+    return False
+
+
+def _count_reads(statements):
+    reads = {}
+
+    for stmt in statements:
+        for expr in _expressions(stmt):
+            for name in _variables(expr):
+                reads[name] = reads.get(name, 0) + 1
+
+        # hinzufügen/setzen braucht den Container ebenfalls
+        if isinstance(stmt, (ast_nodes.Append, ast_nodes.DictSet)):
+            reads[stmt.target] = reads.get(stmt.target, 0) + 1
+
+    return reads
+
+
+def _expressions(stmt):
+    if isinstance(stmt, ast_nodes.Call):
+        return stmt.args
+    if isinstance(stmt, ast_nodes.DictSet):
+        return (stmt.key, stmt.value)
+    return (stmt.value,)
+
+
+def _variables(expr):
+    # Namen aller Lesezugriffe im Ausdruck, ohne den Baum zu verändern
+    if isinstance(expr, ast_nodes.Variable):
+        yield expr.name
+    elif isinstance(expr, ast_nodes.ArrayLiteral):
+        for element in expr.elements:
+            yield from _variables(element)
+    elif isinstance(expr, ast_nodes.DictLiteral):
+        for key, value in expr.entries:
+            yield from _variables(key)
+            yield from _variables(value)
+
+
+def _rewrite_reads(stmt, fn):
+    # ersetzt jeden Ausdruck e in der Anweisung durch fn(e), von innen nach außen
+    if isinstance(stmt, BINDINGS):
+        stmt.value = _rewrite_expression(stmt.value, fn)
+    elif isinstance(stmt, ast_nodes.Call):
+        stmt.args = [_rewrite_expression(a, fn) for a in stmt.args]
+    elif isinstance(stmt, ast_nodes.Append):
+        stmt.value = _rewrite_expression(stmt.value, fn)
+    elif isinstance(stmt, ast_nodes.DictSet):
+        stmt.key = _rewrite_expression(stmt.key, fn)
+        stmt.value = _rewrite_expression(stmt.value, fn)
+
+
+def _rewrite_expression(expr, fn):
+    if isinstance(expr, ast_nodes.ArrayLiteral):
+        expr.elements = [_rewrite_expression(e, fn) for e in expr.elements]
+    elif isinstance(expr, ast_nodes.DictLiteral):
+        expr.entries = [(_rewrite_expression(k, fn), _rewrite_expression(v, fn)) for k, v in expr.entries]
+    return fn(expr)
@@ -0,0 +1,108 @@
+# ============================
+#   AUSGABE
+# ============================
+# Ziel für "x ausgeben.". Die Engines rufen nur sink.write(wert) auf.
+#
+#   PrintSink     bisheriges Verhalten: print() über das aktuelle sys.stdout
+#   BufferedSink  sammelt Zeilen und schreibt sie blockweise als Bytes in
+#                 eine Datei, eine Pipe oder direkt auf den stdout-Deskriptor
+#
+# Die Bytes sind dieselben wie bei print(): str(wert) + "\n", kodiert wie
+# sys.stdout.
+
+
+import sys
+
+BUFFER_SIZE = 1 << 16
+
+FLUSH_POLICIES = ("size", "line", "exit")
+
+
+class PrintSink:
+    def __init__(self):
+        # direkt print: kein zusätzlicher Aufruf pro Zeile
+        self.write = print
+
+    def flush(self):
+        sys.stdout.flush()
+
+    def close(self):
+        self.flush()
+
+
+class BufferedSink:
+    def __init__(
+        self, stream, policy="size", buffer_size=BUFFER_SIZE, encoding="utf-8", errors="strict", owns_stream=False
+    ):
+        if policy not in FLUSH_POLICIES:
+            raise Exception(f"Unbekannte Flush-Strategie: {policy}")
+
+        # stream: binär, z. B. open(pfad, "wb")
+        self.stream = stream
+        self.owns_stream = owns_stream
+        self.encoding = encoding
+        self.errors = errors
+
+        # Zeilen als str sammeln und beim Leeren einmal gesamt kodieren;
+        # pending zählt die Bytes nach dem Kodieren. Bei ASCII-Text in einer
+        # ASCII-kompatiblen Kodierung ist das die Zeichenzahl, nur andere
+        # Zeilen werden dafür schon hier kodiert
+        self.lines = []
+        self.pending = 0
+        self.ascii_compatible = "\n".encode(encoding, errors) == b"\n"
+
+        if policy == "line":
+            self.limit = 0
+        elif policy == "exit":
+            self.limit = float("inf")
+        else:
+            self.limit = buffer_size
+
+    def write(self, value):
+        text = str(value)
+        self.lines.append(text)
+
+        if self.ascii_compatible and text.isascii():
+            self.pending += len(text) + 1
+        else:
+            self.pending += len((text + "\n").encode(self.encoding, self.errors))
+
+        if self.pending >= self.limit:
+            self.flush()
+
+    def flush(self):
+        if not self.lines:
+            return
+
+        data = ("\n".join(self.lines) + "\n").encode(self.encoding, self.errors)
+        self.lines = []
+        self.pending = 0
+
+        self.stream.write(data)
+        self.stream.flush()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            if self.owns_stream:
+                self.stream.close()
+
+
+def open_sink(path=None, policy=None, buffer_size=BUFFER_SIZE):
+    # path None: direkt auf den Deskriptor von stdout, ohne die Textschicht
+    if path is None:
+        sys.stdout.flush()
+        # BufferedWriter: schreibt auch bei Pipes immer vollständig; große
+        # Blöcke gehen an seinem eigenen Puffer vorbei
+        stream = open(sys.stdout.fileno(), "wb", closefd=False)
+        encoding = sys.stdout.encoding
+        errors = sys.stdout.errors
+
+        # am Terminal zeilenweise, wie print() dort auch
+        if policy is None:
+            policy = "line" if sys.stdout.isatty() else "size"
+
+        return BufferedSink(stream, policy, buffer_size, encoding, errors)
+
+    return BufferedSink(open(path, "wb"), policy or "size", buffer_size, owns_stream=True)
@@ -0,0 +1,120 @@
+# ============================
+#   PARALLELES PARSEN
+# ============================
+# Auf oberster Ebene ist ein Programm nur eine Folge von
+# "funktion … funktionsende NAME"-Blöcken. Der Quelltext wird an solchen
+# Grenzen in Stücke von etwa TASK_SIZE Zeichen zerlegt, die ein Prozesspool
+# tokenisiert und parst; die FunctionDefs werden in Quelltextreihenfolge
+# zusammengefügt.
+#
+# Jedes Stück beginnt auf oberster Ebene, der Parser sieht dort dasselbe wie
+# beim seriellen Lauf:
+#   - doppelte Funktionsnamen bleiben in ihrer Reihenfolge erhalten, wie
+#     immer gewinnt später die letzte Definition
+#   - gemeldet wird der Fehler des ersten fehlerhaften Stücks, also derselbe
+#     wie seriell, mit Zeile und Spalte im ganzen Quelltext
+#
+# Die Suche nach Grenzen springt mit str.find von Stück zu Stück, statt wie
+# incremental.split_functions jede Grenze und jede Zeichenkette einzeln per
+# Regex zu besuchen. Ob ein "funktionsende" in einer Zeichenkette steht,
+# entscheidet die Anzahl der '"' seit dem Anfang des Stücks. Bei einer
+# unbeendeten Zeichenkette findet das weniger Grenzen als split_functions,
+# nie andere; das letzte Stück wird dann nur größer.
+
+
+import gc
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import ast_nodes
+from cache import gc_paused
+from parser import Parser
+from tokenizer import LineIndex, tokenize_iter
+
+# Zeichen pro Aufgabe: groß genug, dass Pickeln und Verteilen sich lohnen
+TASK_SIZE = 1 << 18
+
+# kleinere Quelltexte werden seriell geparst, der Pool kostet mehr als er bringt
+MIN_PARALLEL_SIZE = 1 << 20
+
+END_KEYWORD = "funktionsende"
+
+# Name hinter "funktionsende", wie NAME im Tokenizer
+END_NAME = re.compile(r"\s+[^\W\d]\w*")
+
+
+def parse_source(source):
+    # seriell, wie de.load_program
+    return Parser(tokenize_iter(source, normalize_strings=True), source).parse_program()
+
+
+def parse_parallel(source, jobs=None, min_size=MIN_PARALLEL_SIZE, task_size=TASK_SIZE):
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(source) < min_size:
+        return parse_source(source)
+
+    tasks = split_tasks(source, task_size)
+    if len(tasks) < 2:
+        return parse_source(source)
+
+    # Millionen kleiner, zyklenfreier Knoten: der GC würde beim Pickeln und
+    # Entpickeln immer wieder alles durchlaufen (wie beim Laden aus dem
+    # Cache); die Worker leben nur so lange wie der Pool
+    with gc_paused(), ProcessPoolExecutor(max_workers=jobs, initializer=gc.disable) as pool:
+        # map liefert in Aufgabenreihenfolge und wirft die erste Ausnahme
+        # in dieser Reihenfolge, also die des vordersten Fehlers
+        chunks = pool.map(parse_task, *zip(*tasks))
+        functions = [fn for chunk in chunks for fn in chunk]
+
+    return ast_nodes.Program(functions)
+
+
+def split_tasks(source, task_size=TASK_SIZE):
+    # (Text, Anfang, Zeile, Zeilenanfang) je Aufgabe; Zeile und Zeilenanfang
+    # braucht nur eine Fehlermeldung, sie kosten hier ein count pro Aufgabe
+    tasks = []
+    start = 0
+    line = 1
+
+    while start < len(source):
+        end = next_boundary(source, start, start + task_size)
+        tasks.append((source[start:end], start, line, source.rfind("\n", 0, start) + 1))
+        line += source.count("\n", start, end)
+        start = end
+
+    return tasks
+
+
+def next_boundary(source, start, pos):
+    # Ende des ersten "funktionsende NAME" ab pos außerhalb von Zeichenketten;
+    # start muss auf oberster Ebene liegen
+    quotes = 0
+    counted = start
+
+    while True:
+        found = source.find(END_KEYWORD, pos)
+        if found < 0:
+            return len(source)
+
+        quotes += source.count('"', counted, found)
+        counted = found
+        pos = found + 1
+
+        # wie \b im Regex: kein Wortzeichen direkt davor
+        if found > 0 and (source[found - 1].isalnum() or source[found - 1] == "_"):
+            continue
+        if quotes % 2:
+            continue
+
+        name = END_NAME.match(source, found + len(END_KEYWORD))
+        if name is not None:
+            return name.end()
+
+
+def parse_task(text, base, line, line_start):
+    # läuft im Worker; den Zeilenindex baut erst eine Fehlermeldung
+    lines = partial(LineIndex, text, base, line, line_start)
+    tokens = tokenize_iter(text, normalize_strings=True, base=base, source=lines)
+    return Parser(tokens, lines).parse_program().functions
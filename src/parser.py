@@ -1,16 +1,79 @@
 # ============================
-#   PARSER (SKELETON)
+#   PARSER
 # ============================
+# Rekursiver Abstieg über Tabellen: Anweisungen werden über (Tokentyp,
+# Schlüsselwort) ausgewählt, Ausdrücke nach Pratt über Präfix- und
+# Infix-Tabellen je Tokentyp. Ein neuer Operator ist ein Eintrag in
+# INFIX mit Bindungsstärke, kein weiterer Zweig in einer if-Kette.
 
 
 import ast_nodes
-from tokenizer import TokenType
+from tokenizer import TokenType, at_position
+
+# Tokentypen als Modulnamen: ein Vergleich mit "is" statt Attributzugriff
+# auf das Enum pro Token
+IDENTIFIER = TokenType.IDENTIFIER
+KEYWORD = TokenType.KEYWORD
+STRING = TokenType.STRING
+INT = TokenType.INT
+FLOAT = TokenType.FLOAT
+COLON = TokenType.COLON
+DOT = TokenType.DOT
+COMMA = TokenType.COMMA
+LBRACKET = TokenType.LBRACKET
+RBRACKET = TokenType.RBRACKET
+LBRACE = TokenType.LBRACE
+RBRACE = TokenType.RBRACE
+EOF = TokenType.EOF
+
+# (Tokentyp, Schlüsselwort oder None) → Methode für die Anweisung
+STATEMENTS = {
+    # konstante Zeichenkette hallo_welt = "Hallo Welt!".
+    (KEYWORD, "konstante"): "parse_const_decl",
+    (KEYWORD, "variable"): "parse_var_decl",
+    (KEYWORD, "In"): "parse_container_mutation",
+    # hallo_welt ausgeben.
+    (IDENTIFIER, None): "parse_identifier_statement",
+}
+
+# Tokentyp → Methode, die einen Ausdruck beginnt (Pratt: "nud"); Literale
+# stehen in LITERALS und brauchen keine Methode
+PREFIX = {
+    LBRACKET: "parse_array_literal",
+    LBRACE: "parse_dict_literal",
+    IDENTIFIER: "parse_variable",
+}
+
+# Literal-Tokentyp → AST-Knoten
+LITERALS = {
+    STRING: ast_nodes.StringLiteral,
+    INT: ast_nodes.IntLiteral,
+    FLOAT: ast_nodes.FloatLiteral,
+}
+
+# (Tokentyp, Wert) → (Bindungsstärke, Methode(links, Token)) für Operatoren
+# zwischen zwei Ausdrücken (Pratt: "led"); die Sprache hat noch keine
+INFIX = {}
+
+# Tokentypen, mit denen "In x ... hinzufügen." statt "wird ... sein." beginnt
+APPEND_VALUE_TYPES = frozenset((STRING, INT, FLOAT, LBRACKET, LBRACE))
+
+CONTAINER_TYPES = {"Arrayvon", "Vektorvon", "Wörterbuchvon"}
 
 
 class Parser:
-    def __init__(self, tokens):
-        self.tokens = tokens
-        self.pos = 0
+    def __init__(self, tokens, source=None):
+        # Liste oder lazy Generator; der Parser schaut nur ein Token voraus
+        self.next_token = iter(tokens).__next__
+        self.current = self.next_token()
+
+        # Quelltext (oder Funktion, die ihn liefert) nur für Zeile/Spalte in
+        # Fehlermeldungen
+        self.source = source
+
+        # Tabellen einmal an diese Instanz binden
+        self.statements = {key: getattr(self, name) for key, name in STATEMENTS.items()}
+        self.prefix = {key: getattr(self, name) for key, name in PREFIX.items()}
 
     # -------------------------
     #   TOP LEVEL
@@ -18,7 +81,7 @@ class Parser:
     def parse_program(self):
         functions = []
 
-        while not self._peek_type(TokenType.EOF):
+        while self.current.type is not EOF:
             functions.append(self.parse_function())
 
         return ast_nodes.Program(functions)
@@ -27,18 +90,19 @@ class Parser:
     #   FUNCTION
     # -------------------------
     def parse_function(self):
-        self._expect(TokenType.KEYWORD, "funktion")
+        self._expect(KEYWORD, "funktion")
 
-        name = self._expect(TokenType.IDENTIFIER).value
-        self._expect(TokenType.COLON)
+        name = self._expect(IDENTIFIER).value
+        self._expect(COLON)
 
         body = self.parse_block()
 
-        self._expect(TokenType.KEYWORD, "funktionsende")
-        end_name = self._expect(TokenType.IDENTIFIER).value
+        self._expect(KEYWORD, "funktionsende")
+        end_tok = self._expect(IDENTIFIER)
+        end_name = end_tok.value
 
         if end_name != name:
-            raise Exception(f"Funktionsende-Name stimmt nicht überein: {end_name} != {name}")
+            self._error(f"Funktionsende-Name stimmt nicht überein: {end_name} != {name}", end_tok)
 
         return ast_nodes.FunctionDef(name, params=[], body=body)
 
@@ -47,9 +111,14 @@ class Parser:
     # -------------------------
     def parse_block(self):
         statements = []
+        append = statements.append
+        parse_statement = self.parse_statement
 
-        while not self._peek_keyword("funktionsende"):
-            statements.append(self.parse_statement())
+        while True:
+            tok = self.current
+            if tok.type is KEYWORD and tok.value == "funktionsende":
+                break
+            append(parse_statement())
 
         return ast_nodes.Block(statements)
 
@@ -57,117 +126,106 @@ class Parser:
     #   STATEMENTS
     # -------------------------
     def parse_statement(self):
-        tok = self._peek()
-
-        # konstante Zeichenkette hallo_welt = "Hallo Welt!".
-        if tok.type == TokenType.KEYWORD and tok.value == "konstante":
-            return self.parse_const_decl()
+        tok = self.current
+        handler = self.statements.get((tok.type, tok.value if tok.type is KEYWORD else None))
 
-        if tok.type == TokenType.KEYWORD and tok.value == "variable":
-            return self.parse_var_decl()
+        if handler is None:
+            self._error(f"Unerwartete Anweisung: {tok}", tok)
 
-        if tok.type == TokenType.KEYWORD and tok.value == "In":
-            return self.parse_container_mutation()
-
-        # hallo_welt ausgeben.
-        if tok.type == TokenType.IDENTIFIER:
-            return self.parse_identifier_statement()
-
-        raise Exception(f"Unerwartete Anweisung: {tok}")
+        return handler()
 
     def parse_array_literal(self):
-        self._expect(TokenType.LBRACKET)
+        self._expect(LBRACKET)
         elements = []
 
         # empty array
-        if self._peek().type == TokenType.RBRACKET:
+        if self.current.type is RBRACKET:
             self._advance()
             return ast_nodes.ArrayLiteral(elements)
 
         # parse first element
-        elements.append(self.parse_expression())
+        parse_expression = self.parse_expression
+        next_token = self.next_token
+        elements.append(parse_expression())
 
         # parse remaining elements
-        while self._peek().type == TokenType.COMMA:
-            self._advance()  # consume comma
+        while self.current.type is COMMA:
+            self.current = next_token()  # consume comma
 
             # allow trailing comma before }
-            if self._peek().type == TokenType.RBRACE:
+            if self.current.type is RBRACE:
                 break
 
-            elements.append(self.parse_expression())
+            elements.append(parse_expression())
 
-        self._expect(TokenType.RBRACKET)
+        self._expect(RBRACKET)
         return ast_nodes.ArrayLiteral(elements)
 
     def parse_dict_literal(self):
-        self._expect(TokenType.LBRACE)
+        self._expect(LBRACE)
         entries = []
 
         # leeres Wörterbuch
-        if self._peek().type == TokenType.RBRACE:
+        if self.current.type is RBRACE:
             self._advance()
             return ast_nodes.DictLiteral(entries)
 
         # erstes Paar
-        key = self.parse_expression()
-        self._expect(TokenType.COLON)
-        value = self.parse_expression()
+        parse_expression = self.parse_expression
+        next_token = self.next_token
+        key = parse_expression()
+        self._expect(COLON)
+        value = parse_expression()
         entries.append((key, value))
 
         # weitere Paare oder optionales trailing comma
-        while self._peek().type == TokenType.COMMA:
-            self._advance()  # Komma schlucken
+        while self.current.type is COMMA:
+            self.current = next_token()  # Komma schlucken
 
             # trailing comma vor } erlauben
-            if self._peek().type == TokenType.RBRACE:
+            if self.current.type is RBRACE:
                 break
 
-            key = self.parse_expression()
-            self._expect(TokenType.COLON)
-            value = self.parse_expression()
+            key = parse_expression()
+            self._expect(COLON)
+            value = parse_expression()
             entries.append((key, value))
 
-        self._expect(TokenType.RBRACE)
+        self._expect(RBRACE)
         return ast_nodes.DictLiteral(entries)
 
     def parse_container_mutation(self):
-        self._expect(TokenType.KEYWORD, "In")
-        target = self._expect(TokenType.IDENTIFIER).value
+        self._expect(KEYWORD, "In")
+        target = self._expect(IDENTIFIER).value
 
         # append: In namen "Clara" hinzufügen.
-        if self._peek().type == TokenType.STRING or self._peek().type in (
-            TokenType.INT,
-            TokenType.FLOAT,
-            TokenType.LBRACKET,
-            TokenType.LBRACE,
-        ):
+        if self.current.type in APPEND_VALUE_TYPES:
             value = self.parse_expression()
-            self._expect(TokenType.KEYWORD, "hinzufügen")
-            self._expect(TokenType.DOT)
+            self._expect(KEYWORD, "hinzufügen")
+            self._expect(DOT)
             return ast_nodes.Append(target, value)
 
         # dict set: In karte wird 1 "drei" sein.
-        self._expect(TokenType.KEYWORD, "wird")
+        self._expect(KEYWORD, "wird")
         key = self.parse_expression()
         value = self.parse_expression()
-        self._expect(TokenType.KEYWORD, "sein")
-        self._expect(TokenType.DOT)
+        self._expect(KEYWORD, "sein")
+        self._expect(DOT)
         return ast_nodes.DictSet(target, key, value)
 
     # -------------------------
     #   CONST DECL
     # -------------------------
     def parse_const_decl(self):
-        self._expect(TokenType.KEYWORD, "konstante")
+        self._expect(KEYWORD, "konstante")
 
         type_name = self.parse_type()
-        name = self._expect(TokenType.IDENTIFIER).value
+        name = self._expect(IDENTIFIER).value
 
-        self._expect(TokenType.KEYWORD, "ist")
+        self._expect(KEYWORD, "ist")
         value = self.parse_expression()
 
-        self._expect(TokenType.DOT)
+        self._expect(DOT)
 
         return ast_nodes.ConstDecl(name, type_name, value)
 
@@ -175,74 +233,72 @@ class Parser:
     #   VAR DECL
     # -------------------------
     def parse_var_decl(self):
-        self._expect(TokenType.KEYWORD, "variable")
+        self._expect(KEYWORD, "variable")
         type_name = self.parse_type()
-        name = self._expect(TokenType.IDENTIFIER).value
-        self._expect(TokenType.KEYWORD, "ist")
+        name = self._expect(IDENTIFIER).value
+        self._expect(KEYWORD, "ist")
         value = self.parse_expression()
-        self._expect(TokenType.DOT)
+        self._expect(DOT)
         return ast_nodes.VarDecl(name, type_name, value)
 
     # -------------------------
     #   CALL
     # -------------------------
     def parse_call(self):
-        var_name = self._expect(TokenType.IDENTIFIER).value
+        var_name = self._expect(IDENTIFIER).value
 
-        func = self._expect(TokenType.KEYWORD).value  # e.g. "ausgeben"
+        func = self._expect(KEYWORD).value  # e.g. "ausgeben"
 
-        self._expect(TokenType.DOT)
+        self._expect(DOT)
 
         return ast_nodes.Call(func, [ast_nodes.Variable(var_name)])
 
     # -------------------------
-    #   EXPRESSIONS
+    #   EXPRESSIONS (PRATT)
     # -------------------------
-    def parse_expression(self):
-        tok = self._peek()
-
-        # string
-        if tok.type == TokenType.STRING:
-            self._advance()
-            return ast_nodes.StringLiteral(tok.value)
-
-        # int
-        if tok.type == TokenType.INT:
-            self._advance()
-            return ast_nodes.IntLiteral(tok.value)
-
-        # float
-        if tok.type == TokenType.FLOAT:
+    def parse_expression(self, binding_power=0):
+        tok = self.current
+
+        # Literale direkt, ohne Umweg über eine Methode
+        literal = LITERALS.get(tok.type)
+        if literal is not None:
+            self.current = self.next_token()
+            left = literal(tok.value)
+        else:
+            prefix = self.prefix.get(tok.type)
+            if prefix is None:
+                self._error(f"Unerwarteter Ausdruck: {tok}", tok)
+            left = prefix()
+
+        # Operatoren, die stärker binden als der umgebende
+        while INFIX:
+            tok = self.current
+            infix = INFIX.get((tok.type, tok.value))
+            if infix is None or infix[0] <= binding_power:
+                break
             self._advance()
-            return ast_nodes.FloatLiteral(tok.value)
-
-        # array literal
-        if tok.type == TokenType.LBRACKET:
-            return self.parse_array_literal()
+            left = getattr(self, infix[1])(left, tok)
 
-        # dictionary literal
-        if tok.type == TokenType.LBRACE:
-            return self.parse_dict_literal()
+        return left
 
+    def parse_variable(self):
         # variable reference
-        if tok.type == TokenType.IDENTIFIER:
-            self._advance()
-            return ast_nodes.Variable(tok.value)
-
-        raise Exception(f"Unerwarteter Ausdruck: {tok}")
+        tok = self.current
+        self._advance()
+        return ast_nodes.Variable(tok.value)
 
     def parse_type(self):
-        tok = self._peek()
+        tok = self.current
 
         # Types can start with IDENTIFIER (Ganzzahl32) or KEYWORD (Arrayvon)
-        if tok.type not in (TokenType.IDENTIFIER, TokenType.KEYWORD):
-            raise Exception(f"Typ erwartet, bekam {tok}")
+        if tok.type is not IDENTIFIER and tok.type is not KEYWORD:
+            self._error(f"Typ erwartet, bekam {tok}", tok)
 
         base = tok.value
         self._advance()
 
         # simple type like "Ganzzahl32"
-        if base not in {"Arrayvon", "Vektorvon", "Wörterbuchvon"}:
+        if base not in CONTAINER_TYPES:
             return ast_nodes.Type(base)
 
         # -------------------------
@@ -262,52 +318,49 @@ class Parser:
         # -------------------------
         #   Wörterbuchvon Schlüssel T zu Wert U
         # -------------------------
-        if base == "Wörterbuchvon":
-            self._expect(TokenType.KEYWORD, "Schlüssel")
-            key_type = self.parse_type()
-            self._expect(TokenType.KEYWORD, "zu")
-            self._expect(TokenType.KEYWORD, "Wert")
-            value_type = self.parse_type()
-            return ast_nodes.DictType(key_type, value_type)
-
-        raise Exception(f"Unbekannter Typ: {base}")
+        self._expect(KEYWORD, "Schlüssel")
+        key_type = self.parse_type()
+        self._expect(KEYWORD, "zu")
+        self._expect(KEYWORD, "Wert")
+        value_type = self.parse_type()
+        return ast_nodes.DictType(key_type, value_type)
 
     def parse_identifier_statement(self):
-        name_tok = self._expect(TokenType.IDENTIFIER)
+        name_tok = self._expect(IDENTIFIER)
+        tok = self.current
 
         # assignment: <name> ist <expr>.
-        if self._peek().type == TokenType.KEYWORD and self._peek().value == "ist":
+        if tok.type is KEYWORD and tok.value == "ist":
             self._advance()  # consume "ist"
             value = self.parse_expression()
-            self._expect(TokenType.DOT)
+            self._expect(DOT)
             return ast_nodes.Assignment(name_tok.value, value)
 
+        # user function call: <name>.
+        if tok.type is DOT:
+            self._advance()
+            return ast_nodes.Call(name_tok.value, [])
+
         # call: <name> ausgeben.
-        func_tok = self._expect(TokenType.KEYWORD)
-        self._expect(TokenType.DOT)
+        func_tok = self._expect(KEYWORD)
+        self._expect(DOT)
         return ast_nodes.Call(func_tok.value, [ast_nodes.Variable(name_tok.value)])
 
     # -------------------------
     #   HELPERS
     # -------------------------
-    def _peek(self):
-        return self.tokens[self.pos]
-
-    def _peek_type(self, type_):
-        return self._peek().type == type_
-
-    def _peek_keyword(self, value):
-        tok = self._peek()
-        return tok.type == TokenType.KEYWORD and tok.value == value
-
     def _advance(self):
-        self.pos += 1
+        self.current = self.next_token()
 
     def _expect(self, type_, value=None):
-        tok = self._peek()
-        if tok.type != type_:
-            raise Exception(f"Erwartet {type_}, bekam {tok}")
+        tok = self.current
+        if tok.type is not type_:
+            self._error(f"Erwartet {type_}, bekam {tok}", tok)
         if value is not None and tok.value != value:
-            raise Exception(f"Erwartet {value}, bekam {tok.value}")
-        self._advance()
+            self._error(f"Erwartet {value}, bekam {tok.value}", tok)
+        self.current = self.next_token()
         return tok
+
+    def _error(self, message, tok):
+        # Zeile und Spalte entstehen erst hier aus der Position des Tokens
+        raise Exception(at_position(message, tok.offset, self.source))
@@ -0,0 +1,127 @@
+# ============================
+#   PROFILER
+# ============================
+# Für "de.py <datei.de> profilieren": Wanduhrzeit pro Phase (tokenize,
+# parse, resolve, evaluate) sowie Anzahl und kumulierte Zeit pro Funktion
+# und pro Anweisungsart. Gemessen wird auf dem Baum-Evaluator, nur er
+# durchläuft die Anweisungen einzeln.
+#
+# Der Bericht geht nach stderr, die Ausgabe des Programms bleibt auf stdout.
+
+
+import cProfile
+import sys
+import time
+
+import ast_nodes
+from evaluator import Evaluator
+from parser import Parser
+from tokenizer import tokenize_iter
+
+perf_counter = time.perf_counter
+
+
+class ProfilingEvaluator(Evaluator):
+    def __init__(self, program: ast_nodes.Program, output=None):
+        super().__init__(program, output)
+
+        # Name → [Aufrufe, Sekunden]
+        self.function_stats = {}
+        self.statement_stats = {}
+
+    def eval_function(self, fn: ast_nodes.FunctionDef):
+        start = perf_counter()
+        try:
+            super().eval_function(fn)
+        finally:
+            _add(self.function_stats, fn.name, perf_counter() - start)
+
+    def eval_statement(self, stmt):
+        start = perf_counter()
+        try:
+            super().eval_statement(stmt)
+        finally:
+            _add(self.statement_stats, _statement_kind(stmt), perf_counter() - start)
+
+
+def _add(stats, key, seconds):
+    entry = stats.get(key)
+    if entry is None:
+        stats[key] = [1, seconds]
+    else:
+        entry[0] += 1
+        entry[1] += seconds
+
+
+def _statement_kind(stmt):
+    # Aufrufe nach Funktion getrennt, sonst der Knotentyp
+    if isinstance(stmt, ast_nodes.Call):
+        return f"Call {stmt.func}"
+    return type(stmt).__name__
+
+
+# ============================
+#   ABLAUF
+# ============================
+
+
+def profile_file(filename, output, optimize=None, pstats_path=None):
+    # optimize: Programm → Programm (z. B. der -O1-Durchlauf) oder None
+    phases = {}
+    profile = cProfile.Profile() if pstats_path else None
+
+    def phase(name, fn, *args):
+        start = perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            return fn(*args)
+        finally:
+            if profile is not None:
+                profile.disable()
+            phases[name] = perf_counter() - start
+
+    # gleiche Phasen wie de.load_program, aber einzeln gemessen; ohne
+    # preprocess, Fehler zeigen Zeile und Spalte im Quelltext
+    with open(filename, "r", encoding="utf-8") as f:
+        source = f.read()
+
+    tokens = phase("tokenize", lambda: list(tokenize_iter(source, normalize_strings=True)))
+    program = phase("parse", lambda: Parser(tokens, source).parse_program())
+    if optimize is not None:
+        program = phase("optimize", optimize, program)
+
+    evaluator = phase("resolve", ProfilingEvaluator, program, output)
+    try:
+        phase("evaluate", evaluator.run)
+    finally:
+        # auch bei Laufzeitfehlern: der Bericht zeigt, wie weit es kam
+        output.flush()
+        print_report(phases, evaluator, len(tokens), file=sys.stderr)
+
+        if profile is not None:
+            profile.dump_stats(pstats_path)
+            print(f"pstats gespeichert in {pstats_path}", file=sys.stderr)
+
+
+def print_report(phases, evaluator, token_count, file):
+    total = sum(phases.values())
+
+    print("", file=file)
+    print("=== Phasen (Wanduhrzeit) ===", file=file)
+    for name, seconds in phases.items():
+        share = seconds / total * 100 if total else 0.0
+        print(f"  {name:<12} {seconds * 1000:10.2f} ms  {share:5.1f} %", file=file)
+    print(f"  {'gesamt':<12} {total * 1000:10.2f} ms  ({token_count} Tokens)", file=file)
+
+    _print_table("Funktionen", evaluator.function_stats, file)
+    _print_table("Anweisungen", evaluator.statement_stats, file)
+
+
+def _print_table(title, stats, file):
+    print(f"=== {title} (Anzahl, kumulierte Zeit) ===", file=file)
+
+    # teuerste zuerst
+    for name, (count, seconds) in sorted(stats.items(), key=lambda item: -item[1][1]):
+        per_call = seconds / count * 1e6
+        print(f"  {name:<24} {count:>10}x {seconds * 1000:10.2f} ms  {per_call:8.2f} µs/Mal", file=file)
@@ -0,0 +1,70 @@
+# ============================
+#   DAEMON-PROTOKOLL
+# ============================
+# Gemeinsam für daemon.py und client.py. Bewusst ohne Abhängigkeiten zum
+# Interpreter, damit der Client schnell startet.
+#
+# Anfrage:  eine JSON-Zeile, z. B.
+#           {"path": "/abs/datei.de", "engine": "baum", "level": 0}
+#           {"source": "funktion losgehen: ...", "engine": "vm"}
+#           {"command": "stop"}
+# Antwort:  Rahmen aus 1 Byte Art, 4 Byte Länge (big endian), Nutzdaten
+#           O  Ausgabe des Programms (Bytes, gestreamt)
+#           E  Fehlertext (UTF-8)
+#           S  Exit-Status als Dezimalzahl, immer der letzte Rahmen
+
+
+import os
+import stat
+import struct
+
+FRAME_HEADER = struct.Struct(">cI")
+
+OUTPUT = b"O"
+ERROR = b"E"
+STATUS = b"S"
+
+
+def default_socket_path():
+    base = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    return os.path.join(base, f"de-{os.getuid()}.sock")
+
+
+def foreign_socket(path):
+    # Fehlertext, wenn unter path etwas liegt, das nicht unser eigener Socket
+    # ist: in /tmp kann jeder Benutzer den Namen vorher belegen, ein fremder
+    # "Daemon" bekäme sonst Pfade und Quelltext und lieferte die Ausgabe
+    try:
+        info = os.lstat(path)
+    except FileNotFoundError:
+        return None
+
+    if not stat.S_ISSOCK(info.st_mode):
+        return f"{path} ist kein Socket."
+    if info.st_uid != os.getuid():
+        return f"{path} gehört einem anderen Benutzer (uid {info.st_uid})."
+    return None
+
+
+def pack_frame(kind, payload):
+    return FRAME_HEADER.pack(kind, len(payload)) + payload
+
+
+def read_frames(sock):
+    # liefert (Art, Nutzdaten), bis die Verbindung endet
+    buffer = b""
+
+    while True:
+        chunk = sock.recv(1 << 16)
+        if not chunk:
+            return
+        buffer += chunk
+
+        while len(buffer) >= FRAME_HEADER.size:
+            kind, length = FRAME_HEADER.unpack_from(buffer)
+            end = FRAME_HEADER.size + length
+            if len(buffer) < end:
+                break
+
+            yield kind, buffer[FRAME_HEADER.size : end]
+            buffer = buffer[end:]
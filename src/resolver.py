@@ -0,0 +1,207 @@
+# ============================
+#   RESOLVER
+# ============================
+# Statischer Durchlauf vor der Ausführung: jeder lokale Name bekommt pro
+# Funktion einen festen Slot im Frame, Konstanten werden hier geprüft.
+# Zur Laufzeit gibt es danach keine Namensauflösung per dict mehr.
+# Vorher läuft der Typprüfer über dieselbe Funktion.
+#
+# Außerdem werden Aufrufe gelinkt: jeder Call bekommt die aufgerufene
+# FunctionDef als target, die Engines suchen zur Laufzeit nicht nach Namen.
+# Ohne Kontrollfluss wird jeder Aufruf ausgeführt, ein Zyklus in den ab
+# losgehen erreichbaren Funktionen ist also immer eine endlose Rekursion und
+# wird hier schon gemeldet, ebenso
+# eine Aufrufkette, die Pythons Rekursionslimit sprengen würde.
+
+
+import sys
+
+import ast_nodes
+from frozen import freeze_function
+from typecheck import FunctionChecker
+
+# Python-Frames, die ein Aufruf höchstens kostet: im Baum-Evaluator
+# eval_function, eval_block, eval_statement und eval_call, der Profiler
+# schiebt vor eval_function und eval_statement je einen weiteren ein. Ein
+# Rest des Limits bleibt dem Aufrufer.
+FRAMES_PER_CALL = 6
+RESERVED_FRAMES = 50
+
+
+def max_call_depth():
+    # an Pythons Limit gebunden: wer es mit sys.setrecursionlimit anhebt,
+    # erlaubt auch längere Aufrufketten
+    return (sys.getrecursionlimit() - RESERVED_FRAMES) // FRAMES_PER_CALL
+
+
+def call_depth_message():
+    # ohne Rekursion kann nur eine sehr lange Aufrufkette Pythons Stack sprengen
+    return f"Aufrufkette zu tief für Pythons Rekursionslimit ({sys.getrecursionlimit()})."
+
+
+def resolve_program(program: ast_nodes.Program):
+    # wie im Evaluator: spätere Definitionen überschreiben frühere
+    functions = {}
+    for fn in program.functions:
+        functions[fn.name] = fn
+
+    for fn in program.functions:
+        # bereits aufgelöst, z. B. von einer anderen Engine
+        if fn.frame_size is None:
+            FunctionChecker(fn).check()
+            FunctionResolver(fn).resolve()
+            freeze_function(fn)
+
+    # immer neu linken: der IncrementalParser übernimmt unveränderte
+    # Funktionen, deren Aufrufe sonst noch auf die alten Definitionen zeigten
+    for fn in program.functions:
+        link_calls(fn, functions)
+
+    # die Tiefe steht vor dem Lauf fest; alle Engines lehnen dieselben
+    # Programme ab, statt an verschiedenen Stellen an Pythons Limit zu scheitern.
+    # Nie aufgerufene Funktionen laufen nie und werden nicht geprüft.
+    main = functions.get("losgehen")
+    if main is not None:
+        depth = call_depth(main)
+        if depth > max_call_depth():
+            raise Exception(
+                f"Aufrufkette zu tief: {depth} Aufrufe ab 'losgehen', "
+                f"bei Pythons Rekursionslimit ({sys.getrecursionlimit()}) höchstens {max_call_depth()}."
+            )
+
+    return program
+
+
+def link_calls(fn: ast_nodes.FunctionDef, functions):
+    for stmt in fn.body.statements:
+        if isinstance(stmt, ast_nodes.Call) and stmt.func != "ausgeben":
+            # unbekannte Namen bleiben None und scheitern erst zur Laufzeit
+            stmt.target = functions.get(stmt.func)
+
+
+def call_depth(start: ast_nodes.FunctionDef):
+    # Tiefensuche über die gelinkten Aufrufe ab start, mit eigenem Stack statt
+    # Python-Rekursion, damit auch lange Aufrufketten geprüft werden können.
+    # Liefert die längste Aufrufkette ab start.
+    depths = {}
+
+    path = [start]
+    on_path = {id(start): 0}
+    pending = [_callees(start)]
+
+    while pending:
+        callee = next(pending[-1], None)
+
+        if callee is None:
+            fn = path.pop()
+            del on_path[id(fn)]
+            depths[id(fn)] = 1 + max((depths[id(c)] for c in _callees(fn)), default=0)
+            pending.pop()
+            continue
+
+        if id(callee) in on_path:
+            cycle = path[on_path[id(callee)] :] + [callee]
+            names = " → ".join(fn.name for fn in cycle)
+            raise Exception(f"Endlose Rekursion: {names}. Ohne Kontrollfluss endet sie nie.")
+
+        if id(callee) not in depths:
+            on_path[id(callee)] = len(path)
+            path.append(callee)
+            pending.append(_callees(callee))
+
+    return depths[id(start)]
+
+
+def _callees(fn: ast_nodes.FunctionDef):
+    return (stmt.target for stmt in fn.body.statements if isinstance(stmt, ast_nodes.Call) and stmt.target is not None)
+
+
+class FunctionResolver:
+    def __init__(self, fn: ast_nodes.FunctionDef):
+        self.fn = fn
+        self.slots = {}
+
+        # Konstanten gelten nur innerhalb dieser Funktion
+        self.constants = set()
+
+    def resolve(self):
+        for stmt in self.fn.body.statements:
+            self.resolve_statement(stmt)
+
+        self.fn.frame_size = len(self.slots)
+        self.fn.slot_names = tuple(self.slots)
+
+    # -------------------------
+    #   STATEMENTS
+    # -------------------------
+    def resolve_statement(self, stmt):
+        if isinstance(stmt, ast_nodes.ConstDecl):
+            self.resolve_expression(stmt.value)
+            stmt.slot = self._bind(stmt.name)
+            self.constants.add(stmt.name)
+            return
+
+        if isinstance(stmt, (ast_nodes.VarDecl, ast_nodes.Assignment)):
+            self.resolve_expression(stmt.value)
+            stmt.slot = self._bind(stmt.name)
+            return
+
+        if isinstance(stmt, ast_nodes.Call):
+            for arg in stmt.args:
+                self.resolve_expression(arg)
+            return
+
+        if isinstance(stmt, ast_nodes.Append):
+            stmt.slot = self._lookup(stmt.target)
+            self.resolve_expression(stmt.value)
+            return
+
+        if isinstance(stmt, ast_nodes.DictSet):
+            stmt.slot = self._lookup(stmt.target)
+            self.resolve_expression(stmt.key)
+            self.resolve_expression(stmt.value)
+            return
+
+        raise Exception(f"Unbekannte Anweisung: {stmt}")
+
+    # -------------------------
+    #   EXPRESSIONS
+    # -------------------------
+    def resolve_expression(self, expr):
+        if isinstance(expr, ast_nodes.Variable):
+            expr.slot = self._lookup(expr.name)
+            return
+
+        if isinstance(expr, ast_nodes.ArrayLiteral):
+            for element in expr.elements:
+                self.resolve_expression(element)
+            return
+
+        if isinstance(expr, ast_nodes.DictLiteral):
+            for key, value in expr.entries:
+                self.resolve_expression(key)
+                self.resolve_expression(value)
+            return
+
+        if isinstance(expr, (ast_nodes.IntLiteral, ast_nodes.FloatLiteral, ast_nodes.StringLiteral)):
+            return
+
+        raise Exception(f"Unbekannter Ausdruck: {expr}")
+
+    # -------------------------
+    #   HELPERS
+    # -------------------------
+    def _bind(self, name):
+        if name in self.constants:
+            raise Exception(f"Konstante '{name}' kann nicht geändert werden.")
+
+        if name not in self.slots:
+            self.slots[name] = len(self.slots)
+        return self.slots[name]
+
+    def _lookup(self, name):
+        # ohne Kontrollfluss ist jeder Lesezugriff vor der ersten Bindung
+        # statisch erkennbar
+        if name not in self.slots:
+            raise Exception(f"Variable '{name}' ist nicht definiert.")
+        return self.slots[name]
@@ -1,3 +1,6 @@
+import re
+import sys
+from bisect import bisect_right
 from enum import Enum, auto
 
 # ============================
@@ -22,9 +25,14 @@ class TokenType(Enum):
 
 
 class Token:
-    def __init__(self, type_, value=None):
+    # offset: Zeichenposition im Quelltext; Zeile und Spalte berechnet erst
+    # eine Fehlermeldung (siehe LineIndex)
+    __slots__ = ("type", "value", "offset")
+
+    def __init__(self, type_, value=None, offset=None):
         self.type = type_
         self.value = value
+        self.offset = offset
 
     def __repr__(self):
         if self.value is None:
@@ -32,6 +40,16 @@ class Token:
         return f"Token({self.type}, {self.value})"
 
 
+# ============================
+#   SYMBOLE
+# ============================
+# Namen und Schlüsselwörter werden beim Tokenisieren interniert: alle
+# Vorkommen desselben Namens teilen ein str-Objekt mit einmal berechnetem
+# Hash. Vergleiche in Parser, Resolver und den Funktionstabellen treffen
+# so zuerst die Identität, und ein Name, der 100 000-mal vorkommt, liegt
+# nur einmal im Speicher (auch im pickle des Caches).
+intern_symbol = sys.intern
+
 KEYWORDS = {
     "funktion",
     "funktionsende",
@@ -72,6 +90,8 @@ class Tokenizer:
                 self._advance()
                 continue
 
+            start = self.pos
+
             # string literal
             if ch == '"':
                 tokens.append(self._read_string())
@@ -88,44 +108,14 @@ class Tokenizer:
                 continue
 
             # punctuation
-            if ch == ".":
-                tokens.append(Token(TokenType.DOT, "."))
-                self._advance()
-                continue
-
-            if ch == ",":
-                tokens.append(Token(TokenType.COMMA, ","))
-                self._advance()
-                continue
-
-            if ch == ":":
-                tokens.append(Token(TokenType.COLON, ":"))
-                self._advance()
-                continue
-
-            if ch == "[":
-                tokens.append(Token(TokenType.LBRACKET, "["))
-                self._advance()
-                continue
-
-            if ch == "]":
-                tokens.append(Token(TokenType.RBRACKET, "]"))
+            if ch in PUNCTUATION:
+                tokens.append(Token(PUNCTUATION[ch], ch, start))
                 self._advance()
                 continue
 
-            if ch == "{":
-                tokens.append(Token(TokenType.LBRACE, "{"))
-                self._advance()
-                continue
+            raise Exception(at_position(f"Unerwartetes Zeichen: {ch}", start, self.text))
 
-            if ch == "}":
-                tokens.append(Token(TokenType.RBRACE, "}"))
-                self._advance()
-                continue
-
-            raise Exception(f"Unerwartetes Zeichen: {ch}")
-
-        tokens.append(Token(TokenType.EOF))
+        tokens.append(Token(TokenType.EOF, None, self.pos))
         return tokens
 
     # --- helpers ---
@@ -144,21 +134,6 @@ class Tokenizer:
     def _advance(self):
         self.pos += 1
 
-    def _read_identifier_or_keyword(self):
-        start = self.pos
-        while not self._end() and (self._peek().isalnum() or self._peek() == "_"):
-            self._advance()
-        word = self.text[start : self.pos]
-
-        # declension-aware keyword: "konstant..."
-        if word.startswith("konstant"):
-            return Token(TokenType.KEYWORD, "konstante")
-
-        if word in KEYWORDS:
-            return Token(TokenType.KEYWORD, word)
-
-        return Token(TokenType.IDENTIFIER, word)
-
     def _read_string(self):
         self._advance()  # skip opening "
         start = self.pos
@@ -167,11 +142,11 @@ class Tokenizer:
             self._advance()
 
         if self._end():
-            raise Exception("Unbeendeter String")
+            raise Exception(at_position("Unbeendeter String", start - 1, self.text))
 
         value = self.text[start : self.pos]
         self._advance()  # skip closing "
-        return Token(TokenType.STRING, value)
+        return Token(TokenType.STRING, value, start - 1)
 
     def _number(self):
         start = self.pos
@@ -191,11 +166,11 @@ class Tokenizer:
             int_part = self.text[start : decimal_start - 1]
             frac_part = self.text[decimal_start : self.pos]
             value = float(int_part + "." + frac_part)
-            return Token(TokenType.FLOAT, value)
+            return Token(TokenType.FLOAT, value, start)
 
         # integer
         value = int(self.text[start : self.pos])
-        return Token(TokenType.INT, value)
+        return Token(TokenType.INT, value, start)
 
     def _identifier_or_keyword(self):
         start = self.pos
@@ -203,9 +178,191 @@ class Tokenizer:
         while not self._end() and (self._peek().isalnum() or self._peek() == "_"):
             self._advance()
 
-        text = self.text[start : self.pos]
+        text = intern_symbol(self.text[start : self.pos])
+
+        # declension-aware keyword: "konstant..."
+        if text.startswith("konstant"):
+            return Token(TokenType.KEYWORD, "konstante", start)
 
         if text in KEYWORDS:
-            return Token(TokenType.KEYWORD, text)
+            return Token(TokenType.KEYWORD, text, start)
+
+        return Token(TokenType.IDENTIFIER, text, start)
+
+
+# ============================
+#   REGEX TOKENIZER
+# ============================
+# Ein einziger kompilierter Ausdruck mit benannten Gruppen; die Schleife über
+# die Treffer läuft in C, Python sieht nur noch einen Treffer pro Token.
+
+TOKEN_PATTERN = re.compile(
+    r"""
+    \s*
+    (?:
+        (?P<NAME>[^\W\d]\w*)
+      | (?P<PUNCT>[.,:\[\]{}])
+      | (?P<STRING>"[^"]*")
+      | (?P<FLOAT>\d+,\d+)
+      | (?P<INT>\d+)
+      | (?P<ERROR>.)
+      | $
+    )
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+PUNCTUATION = {
+    ".": TokenType.DOT,
+    ",": TokenType.COMMA,
+    ":": TokenType.COLON,
+    "[": TokenType.LBRACKET,
+    "]": TokenType.RBRACKET,
+    "{": TokenType.LBRACE,
+    "}": TokenType.RBRACE,
+}
+
+
+# preprocess() in de.py fasst Whitespace auch innerhalb von Zeichenketten
+# zusammen; beim Lesen direkt aus der Datei passiert das hier
+STRING_WHITESPACE = re.compile(r"\s+")
+
+# Zeichen pro Lesevorgang beim Tokenisieren direkt aus einer Datei
+CHUNK_SIZE = 1 << 20
+
+
+def tokenize_iter(text, normalize_strings=False, base=0, source=None):
+    # lazy generator, liefert dieselben Tokens wie Tokenizer.tokenize();
+    # ist text ein Ausschnitt, ist base sein Anfang im ganzen Quelltext source
+    yield from _scan(text, True, normalize_strings, base, source if source is not None else text)
+    yield Token(TokenType.EOF, None, base + len(text))
+
+
+def tokenize_file(f, chunk_size=CHUNK_SIZE):
+    # liest die Datei stückweise; es liegt nie mehr als ein Stück plus der
+    # Rest eines angeschnittenen Tokens im Speicher
+    buffer = ""
+    base = 0
+
+    # für Fehlermeldungen wird die Datei erst im Fehlerfall neu gelesen
+    def source():
+        f.seek(0)
+        return f.read()
+
+    while True:
+        chunk = f.read(chunk_size)
+        final = not chunk
+
+        buffer = buffer + chunk if buffer else chunk
+        consumed = yield from _scan(buffer, final, True, base, source)
+
+        if final:
+            break
+        buffer = buffer[consumed:]
+        base += consumed
+
+    yield Token(TokenType.EOF, None, base + len(buffer))
+
+
+def _scan(buffer, final, normalize_strings, base, source):
+    # Liefert die Tokens in buffer und gibt die Position zurück, bis zu der
+    # gelesen wurde. Ist final falsch, bleibt ein Token, das am Ende des
+    # Puffers angeschnitten sein könnte (auch "12," vor "5"), für den
+    # nächsten Aufruf liegen. base ist die Position von buffer im Quelltext.
+    keyword = TokenType.KEYWORD
+    identifier = TokenType.IDENTIFIER
+    keywords = KEYWORDS
+    punctuation = PUNCTUATION
+    intern = intern_symbol
+    limit = len(buffer) + 1 if final else len(buffer) - 1
+
+    for match in TOKEN_PATTERN.finditer(buffer):
+        if match.end() >= limit:
+            return match.start()
+
+        kind = match.lastgroup
+        if kind is None:
+            # nur noch Whitespace bis zum Pufferende
+            continue
+
+        # span statt group: die Position kommt ohne weiteren Aufruf mit
+        start, end = match.span(kind)
+        offset = base + start
+
+        if kind == "NAME":
+            word = intern(buffer[start:end])
+
+            if word in keywords:
+                yield Token(keyword, word, offset)
+            # declension-aware keyword: "konstant..."
+            elif word.startswith("konstant"):
+                yield Token(keyword, "konstante", offset)
+            else:
+                yield Token(identifier, word, offset)
+
+        elif kind == "PUNCT":
+            ch = buffer[start]
+            yield Token(punctuation[ch], ch, offset)
+
+        elif kind == "STRING":
+            value = buffer[start + 1 : end - 1]
+            if normalize_strings:
+                value = STRING_WHITESPACE.sub(" ", value)
+            yield Token(TokenType.STRING, value, offset)
+
+        elif kind == "FLOAT":
+            yield Token(TokenType.FLOAT, float(buffer[start:end].replace(",", ".")), offset)
+
+        elif kind == "INT":
+            yield Token(TokenType.INT, int(buffer[start:end]), offset)
+
+        else:
+            ch = buffer[start]
+            if ch == '"':
+                # das Ende der Zeichenkette kann im nächsten Stück liegen
+                if not final:
+                    return start
+                raise Exception(at_position("Unbeendeter String", offset, source))
+            raise Exception(at_position(f"Unerwartetes Zeichen: {ch}", offset, source))
+
+    return len(buffer)
+
+
+# ============================
+#   POSITIONEN
+# ============================
+# Tokens tragen nur ihre Zeichenposition. Den Index der Zeilenanfänge baut
+# erst eine Fehlermeldung, einmal pro Quelltext; Zeile und Spalte sucht dann
+# bisect. Der Tokenizer zählt keine Zeilen.
+
+
+class LineIndex:
+    def __init__(self, text, base=0, line=1, line_start=0):
+        # text steht ab Position base im Quelltext, in Zeile line, die bei
+        # line_start beginnt; für den ganzen Quelltext alles Standard
+        self.first_line = line
+
+        # Position des ersten Zeichens jeder Zeile
+        self.starts = [line_start]
+        self.starts.extend(base + match.end() for match in NEWLINE.finditer(text))
+
+    def position(self, offset):
+        # (Zeile, Spalte), beide ab 1
+        index = bisect_right(self.starts, offset)
+        return self.first_line + index - 1, offset - self.starts[index - 1] + 1
+
+
+NEWLINE = re.compile("\n")
+
+
+def at_position(message, offset, source):
+    # source: Quelltext, LineIndex oder eine Funktion, die eins davon liefert
+    if offset is None or source is None:
+        return message
+
+    if callable(source):
+        source = source()
+    lines = source if isinstance(source, LineIndex) else LineIndex(source)
 
-        return Token(TokenType.IDENTIFIER, text)
+    line, column = lines.position(offset)
+    return f"{message} (Zeile {line}, Spalte {column})"
@@ -0,0 +1,287 @@
+# ============================
+#   TRANSPILER (de → Python)
+# ============================
+# Übersetzt ein Programm in ein Python-ast.Module und kompiliert es mit
+# compile(). Den Dispatch übernimmt danach CPythons eigener Interpreter.
+
+
+import ast
+import hashlib
+import threading
+
+import ast_nodes
+from frozen import FROZEN_TYPES, FrozenDict, FrozenList, FrozenTypedArray, thaw
+from output import PrintSink
+from resolver import call_depth_message, resolve_program
+from typecheck import SEQUENCE_TYPES, TypedArray
+
+FUNCTION_PREFIX = "de_"
+
+# Name der Ausgabefunktion im Namensraum des erzeugten Moduls
+OUTPUT_NAME = "AUSGEBEN"
+
+# eingefrorene Literale werden Modulkonstanten LITERAL_0, LITERAL_1, ...
+LITERAL_PREFIX = "LITERAL_"
+
+# (Variante, Quelltext-Hash) → Python-Codeobjekt; die Sperre schützt ihn
+# vor den Worker-Threads des Daemons
+_code_cache = {}
+_code_cache_lock = threading.Lock()
+MAX_CACHE_ENTRIES = 256
+
+
+class PythonEngine:
+    def __init__(self, program: ast_nodes.Program, code=None, output=None):
+        self.program = program
+        self.code = code if code is not None else transpile(program)
+        self.output = output if output is not None else PrintSink()
+
+    # -------------------------
+    #   ENTRY POINT
+    # -------------------------
+    def run(self):
+        namespace = {
+            "__builtins__": __builtins__,
+            "SEQUENCE_TYPES": SEQUENCE_TYPES,
+            "TypedArray": TypedArray,
+            "FrozenList": FrozenList,
+            "FrozenDict": FrozenDict,
+            "FrozenTypedArray": FrozenTypedArray,
+            "FROZEN_TYPES": FROZEN_TYPES,
+            "thaw": thaw,
+            OUTPUT_NAME: self.output.write,
+        }
+        exec(self.code, namespace)
+
+        main = namespace.get(FUNCTION_PREFIX + "losgehen")
+        if main is None:
+            raise Exception("Keine Funktion 'losgehen' gefunden.")
+
+        try:
+            main()
+        except RecursionError:
+            raise Exception(call_depth_message()) from None
+
+
+# ============================
+#   CACHE
+# ============================
+
+
+def run_source(source, load_program, variant=0, output=None):
+    # load_program: Quelltext → ast_nodes.Program, nur bei Cache-Fehlschlag;
+    # variant trennt Übersetzungen desselben Quelltexts (z. B. -O0/-O1)
+    key = (variant, hashlib.sha256(source.encode("utf-8")).digest())
+    with _code_cache_lock:
+        code = _code_cache.get(key)
+
+    if code is None:
+        # außerhalb der Sperre übersetzen; laufen zwei Threads gleichzeitig
+        # hier durch, gewinnt der zweite Eintrag
+        code = transpile(load_program(source))
+
+        with _code_cache_lock:
+            if key not in _code_cache and len(_code_cache) >= MAX_CACHE_ENTRIES:
+                del _code_cache[next(iter(_code_cache))]
+            _code_cache[key] = code
+
+    PythonEngine(None, code, output).run()
+
+
+def clear_cache():
+    with _code_cache_lock:
+        _code_cache.clear()
+
+
+# ============================
+#   LOWERING
+# ============================
+
+
+def transpile(program: ast_nodes.Program):
+    module = lower_program(program)
+    return compile(module, "<de>", "exec")
+
+
+def lower_program(program: ast_nodes.Program):
+    resolve_program(program)
+
+    # wie im Evaluator: spätere Definitionen überschreiben frühere
+    functions = {}
+    for fn in program.functions:
+        functions[fn.name] = fn
+
+    literals = LiteralTable()
+    body = [FunctionLowering(fn, literals).lower() for fn in functions.values()]
+
+    # Konstanten vor den Funktionen, einmal pro Lauf gebaut
+    module = ast.Module(body=literals.body + body, type_ignores=[])
+    return ast.fix_missing_locations(module)
+
+
+class LiteralTable:
+    # eingefrorener Wert → Name der Modulkonstante; verschachtelte Werte
+    # bekommen eigene Namen, damit sie wie in den anderen Engines geteilt sind
+    def __init__(self):
+        self.names = {}
+        self.body = []
+
+    def name(self, value):
+        if id(value) in self.names:
+            return self.names[id(value)]
+
+        if type(value) is FrozenDict:
+            items = ast.Dict(keys=[self._element(k) for k in value], values=[self._element(v) for v in value.values()])
+            build = _call("FrozenDict", [items])
+        elif type(value) is FrozenTypedArray:
+            items = ast.List(elts=[ast.Constant(v) for v in value], ctx=ast.Load())
+            build = _call("FrozenTypedArray", [ast.Constant(value.element_type), items])
+        else:
+            items = ast.List(elts=[self._element(v) for v in value], ctx=ast.Load())
+            build = _call("FrozenList", [items])
+
+        name = f"{LITERAL_PREFIX}{len(self.body)}"
+        self.names[id(value)] = name
+        self.body.append(ast.Assign(targets=[ast.Name(id=name, ctx=ast.Store())], value=build))
+        return name
+
+    def _element(self, value):
+        if type(value) in FROZEN_TYPES:
+            return ast.Name(id=self.name(value), ctx=ast.Load())
+        return ast.Constant(value)
+
+
+class FunctionLowering:
+    def __init__(self, fn: ast_nodes.FunctionDef, literals):
+        self.fn = fn
+        self.literals = literals
+
+    def lower(self):
+        # Rekursion lehnt der Resolver ab; die Frames sind Pythons eigene
+        body = []
+
+        for stmt in self.fn.body.statements:
+            lowered = self.lower_statement(stmt)
+            body.extend(lowered)
+
+            # eine Ausnahme beendet ohnehin das ganze Programm
+            if isinstance(lowered[-1], ast.Raise):
+                break
+
+        if not body:
+            body.append(ast.Pass())
+
+        return ast.FunctionDef(
+            name=FUNCTION_PREFIX + self.fn.name,
+            args=ast.arguments(posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[]),
+            body=body,
+            decorator_list=[],
+        )
+
+    # -------------------------
+    #   STATEMENTS
+    # -------------------------
+    def lower_statement(self, stmt):
+        if isinstance(stmt, (ast_nodes.ConstDecl, ast_nodes.VarDecl, ast_nodes.Assignment)):
+            value = self.lower_expression(stmt.value)
+            return [ast.Assign(targets=[_local(stmt.slot, ast.Store())], value=value)]
+
+        if isinstance(stmt, ast_nodes.Call):
+            return self.lower_call(stmt)
+
+        if isinstance(stmt, ast_nodes.Append):
+            value = self.lower_expression(stmt.value)
+            message = f"Kann nicht zu {stmt.target} hinzufügen: kein Vektor/Array"
+            return [
+                _type_guard(_local(stmt.slot), "SEQUENCE_TYPES", message),
+                _thaw(stmt.slot),
+                ast.Expr(_method_call(_local(stmt.slot), "append", [value])),
+            ]
+
+        if isinstance(stmt, ast_nodes.DictSet):
+            key = self.lower_expression(stmt.key)
+            value = self.lower_expression(stmt.value)
+            message = f"Kann keinen Schlüssel in {stmt.target} setzen: kein Wörterbuch"
+            subscript = ast.Subscript(value=_local(stmt.slot), slice=key, ctx=ast.Store())
+            return [
+                _type_guard(_local(stmt.slot), "dict", message),
+                _thaw(stmt.slot),
+                ast.Assign(targets=[subscript], value=value),
+            ]
+
+        raise Exception(f"Unbekannte Anweisung: {stmt}")
+
+    # -------------------------
+    #   CALL
+    # -------------------------
+    def lower_call(self, call: ast_nodes.Call):
+        if call.func == "ausgeben":
+            args = [self.lower_expression(a) for a in call.args]
+            return [ast.Expr(_call(OUTPUT_NAME, [args[0]]))]
+
+        # gelinkt: das Ziel ist die Modulfunktion der letzten Definition
+        if call.target is not None:
+            return [ast.Expr(_call(FUNCTION_PREFIX + call.target.name, []))]
+
+        return [_raise("Exception", f"Unbekannte Funktion: {call.func}")]
+
+    # -------------------------
+    #   EXPRESSIONS
+    # -------------------------
+    def lower_expression(self, expr):
+        if isinstance(expr, (ast_nodes.IntLiteral, ast_nodes.FloatLiteral, ast_nodes.StringLiteral)):
+            return ast.Constant(expr.value)
+
+        if isinstance(expr, ast_nodes.Variable):
+            return _local(expr.slot)
+
+        if isinstance(expr, (ast_nodes.ArrayLiteral, ast_nodes.DictLiteral)) and expr.frozen is not None:
+            return ast.Name(id=self.literals.name(expr.frozen), ctx=ast.Load())
+
+        if isinstance(expr, ast_nodes.ArrayLiteral):
+            elements = ast.List(elts=[self.lower_expression(e) for e in expr.elements], ctx=ast.Load())
+            if expr.element_type is not None:
+                return _call("TypedArray", [ast.Constant(expr.element_type), elements])
+            return elements
+
+        if isinstance(expr, ast_nodes.DictLiteral):
+            keys = []
+            values = []
+            for k, v in expr.entries:
+                keys.append(self.lower_expression(k))
+                values.append(self.lower_expression(v))
+            return ast.Dict(keys=keys, values=values)
+
+        raise Exception(f"Unbekannter Ausdruck: {expr}")
+
+
+def _local(slot, ctx=None):
+    # Slots des Resolvers werden zu Python-Lokalen v0, v1, ...; so entstehen
+    # keine Kollisionen mit Python-Schlüsselwörtern oder NFKC-Normalisierung
+    return ast.Name(id=f"v{slot}", ctx=ctx or ast.Load())
+
+
+def _call(func, args):
+    return ast.Call(func=ast.Name(id=func, ctx=ast.Load()), args=args, keywords=[])
+
+
+def _method_call(obj, method, args):
+    return ast.Call(func=ast.Attribute(value=obj, attr=method, ctx=ast.Load()), args=args, keywords=[])
+
+
+def _raise(exc_type, message):
+    return ast.Raise(exc=_call(exc_type, [ast.Constant(message)]), cause=None)
+
+
+def _thaw(slot):
+    # if type(v) in FROZEN_TYPES: v = thaw(v)
+    test = ast.Compare(
+        left=_call("type", [_local(slot)]), ops=[ast.In()], comparators=[ast.Name(id="FROZEN_TYPES", ctx=ast.Load())]
+    )
+    body = [ast.Assign(targets=[_local(slot, ast.Store())], value=_call("thaw", [_local(slot)]))]
+    return ast.If(test=test, body=body, orelse=[])
+
+
+def _type_guard(value, type_name, message):
+    check = ast.UnaryOp(op=ast.Not(), operand=_call("isinstance", [value, ast.Name(id=type_name, ctx=ast.Load())]))
+    return ast.If(test=check, body=[_raise("Exception", message)], orelse=[])
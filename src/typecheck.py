@@ -0,0 +1,273 @@
+# ============================
+#   TYPE CHECKER
+# ============================
+# Statischer Durchlauf über die deklarierten Typen. Er prüft Literale gegen
+# den Typ ihrer Deklaration (inklusive Wertebereich der Ganzzahltypen) und
+# markiert Array-Literale numerischer Arrayvon/Vektorvon-Deklarationen, damit
+# die Engines sie als gepacktes array statt als Liste von Objekten anlegen.
+
+
+from array import array
+
+import ast_nodes
+
+
+class NumericType:
+    def __init__(self, python_type, bits, signed):
+        self.python_type = python_type
+
+        if python_type is float:
+            # auch Fließ32 als double: float32 würde die Ausgabe verändern
+            self.typecode = "d"
+            self.low = None
+            self.high = None
+            return
+
+        self.typecode = _smallest_typecode(bits, signed)
+        if signed:
+            self.low = -(2 ** (bits - 1))
+            self.high = 2 ** (bits - 1) - 1
+        else:
+            self.low = 0
+            self.high = 2**bits - 1
+
+
+def _smallest_typecode(bits, signed):
+    for code in "bhilq" if signed else "BHILQ":
+        if array(code).itemsize * 8 >= bits:
+            return code
+    raise Exception(f"Kein array-Typ für {bits} Bit")
+
+
+NUMERIC_TYPES = {
+    "Ganzzahl8": NumericType(int, 8, signed=False),
+    "Ganzzahl16": NumericType(int, 16, signed=False),
+    "Ganzzahl32": NumericType(int, 32, signed=False),
+    "Ganzzahl64": NumericType(int, 64, signed=False),
+    "Zahl8": NumericType(int, 8, signed=True),
+    "Zahl16": NumericType(int, 16, signed=True),
+    "Zahl32": NumericType(int, 32, signed=True),
+    "Zahl64": NumericType(int, 64, signed=True),
+    "Fließ32": NumericType(float, 32, signed=True),
+    "Fließ64": NumericType(float, 64, signed=True),
+}
+
+STRING_TYPE = "Zeichenkette"
+
+
+# ============================
+#   TYPED STORAGE
+# ============================
+
+
+class TypedArray(array):
+    # gepackte Ablage für Arrayvon/Vektorvon mit numerischem Elementtyp;
+    # wird wie eine Liste ausgegeben
+    __slots__ = ("element_type",)
+
+    def __new__(cls, element_type, values=()):
+        info = NUMERIC_TYPES[element_type]
+
+        # array prüft Ganzzahlen selbst (Typ und Bereich passen zum C-Typ),
+        # nimmt für "d" aber auch int an
+        if info.python_type is float:
+            for value in values:
+                check_element(value, element_type, info)
+
+        try:
+            self = array.__new__(cls, info.typecode, values)
+        except (OverflowError, TypeError):
+            for value in values:
+                check_element(value, element_type, info)
+            raise
+
+        self.element_type = element_type
+        return self
+
+    def append(self, value):
+        # schneller Weg: array prüft selbst, nur int in "d" muss abgefangen werden
+        if self.typecode != "d" or type(value) is float:
+            try:
+                array.append(self, value)
+                return
+            except (OverflowError, TypeError):
+                pass
+
+        check_element(value, self.element_type, NUMERIC_TYPES[self.element_type])
+        array.append(self, value)
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    # array.__copy__ liefert ein nacktes array ohne element_type
+    def __copy__(self):
+        copy = array.__new__(type(self), self.typecode, self)
+        copy.element_type = self.element_type
+        return copy
+
+    def __deepcopy__(self, memo):
+        # Elemente sind Zahlen, eine flache Kopie ist schon tief
+        return self.__copy__()
+
+    def __reduce_ex__(self, protocol):
+        # array.__reduce_ex__ verliert element_type ebenso
+        return type(self), (self.element_type, self.tolist())
+
+
+# Container, in die "In x ... hinzufügen." schreiben darf
+SEQUENCE_TYPES = (list, TypedArray)
+
+
+def check_element(value, type_name, info):
+    if type(value) is not info.python_type:
+        raise Exception(f"Typfehler: {value!r} ist kein Wert vom Typ {type_name}.")
+
+    if info.low is not None and not info.low <= value <= info.high:
+        raise Exception(f"Wert {value} liegt außerhalb des Bereichs von {type_name} ({info.low} bis {info.high}).")
+
+
+# ============================
+#   CHECKER
+# ============================
+
+
+def type_name(type_):
+    if isinstance(type_, ast_nodes.Type):
+        return type_.name
+    if isinstance(type_, ast_nodes.ArrayType):
+        return f"Arrayvon {type_name(type_.inner)}"
+    if isinstance(type_, ast_nodes.VectorType):
+        return f"Vektorvon {type_name(type_.inner)}"
+    if isinstance(type_, ast_nodes.DictType):
+        return f"Wörterbuchvon Schlüssel {type_name(type_.key_type)} zu Wert {type_name(type_.value_type)}"
+    return str(type_)
+
+
+class FunctionChecker:
+    def __init__(self, fn: ast_nodes.FunctionDef):
+        self.fn = fn
+
+        # Name → deklarierter Typ
+        self.types = {}
+
+    def check(self):
+        for stmt in self.fn.body.statements:
+            self.check_statement(stmt)
+
+    # -------------------------
+    #   STATEMENTS
+    # -------------------------
+    def check_statement(self, stmt):
+        if isinstance(stmt, (ast_nodes.ConstDecl, ast_nodes.VarDecl)):
+            self.check_value(stmt.value, stmt.type, stmt.name)
+            self.types[stmt.name] = stmt.type
+            return
+
+        if isinstance(stmt, ast_nodes.Assignment):
+            declared = self.types.get(stmt.name)
+            if declared is not None:
+                self.check_value(stmt.value, declared, stmt.name)
+            return
+
+        if isinstance(stmt, ast_nodes.Append):
+            declared = self.types.get(stmt.target)
+            if isinstance(declared, (ast_nodes.ArrayType, ast_nodes.VectorType)):
+                self.check_value(stmt.value, declared.inner, stmt.target)
+            return
+
+        if isinstance(stmt, ast_nodes.DictSet):
+            declared = self.types.get(stmt.target)
+            if isinstance(declared, ast_nodes.DictType):
+                self.check_value(stmt.key, declared.key_type, stmt.target)
+                self.check_value(stmt.value, declared.value_type, stmt.target)
+            return
+
+    # -------------------------
+    #   VALUES
+    # -------------------------
+    def check_value(self, expr, expected, name):
+        # Variablen: deklarierter Typ muss übereinstimmen
+        if isinstance(expr, ast_nodes.Variable):
+            declared = self.types.get(expr.name)
+            if declared is not None and not same_type(declared, expected):
+                self._mismatch(name, expected, type_name(declared))
+            return
+
+        if isinstance(expected, ast_nodes.Type):
+            self.check_scalar(expr, expected.name, name)
+            return
+
+        if isinstance(expected, (ast_nodes.ArrayType, ast_nodes.VectorType)):
+            if not isinstance(expr, ast_nodes.ArrayLiteral):
+                self._mismatch(name, expected, _describe(expr))
+
+            for element in expr.elements:
+                self.check_value(element, expected.inner, name)
+
+            # numerische Elemente: gepackt ablegen
+            if isinstance(expected.inner, ast_nodes.Type) and expected.inner.name in NUMERIC_TYPES:
+                expr.element_type = expected.inner.name
+            return
+
+        if isinstance(expected, ast_nodes.DictType):
+            if not isinstance(expr, ast_nodes.DictLiteral):
+                self._mismatch(name, expected, _describe(expr))
+
+            for key, value in expr.entries:
+                self.check_value(key, expected.key_type, name)
+                self.check_value(value, expected.value_type, name)
+
+    def check_scalar(self, expr, expected, name):
+        info = NUMERIC_TYPES.get(expected)
+
+        # unbekannte Typnamen werden (noch) nicht geprüft
+        if info is None and expected != STRING_TYPE:
+            return
+
+        if isinstance(expr, ast_nodes.StringLiteral):
+            if expected != STRING_TYPE:
+                self._mismatch(name, expected, STRING_TYPE)
+            return
+
+        if isinstance(expr, (ast_nodes.IntLiteral, ast_nodes.FloatLiteral)):
+            if info is None or type(expr.value) is not info.python_type:
+                self._mismatch(name, expected, _describe(expr))
+
+            if info.low is not None and not info.low <= expr.value <= info.high:
+                raise Exception(
+                    f"Wert {expr.value} liegt außerhalb des Bereichs von {expected} "
+                    f"({info.low} bis {info.high}) in '{name}'."
+                )
+            return
+
+        self._mismatch(name, expected, _describe(expr))
+
+    def _mismatch(self, name, expected, actual):
+        expected = expected if isinstance(expected, str) else type_name(expected)
+        raise Exception(f"Typfehler in '{name}': erwartet {expected}, bekam {actual}.")
+
+
+def same_type(a, b):
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, ast_nodes.Type):
+        return a.name == b.name
+    if isinstance(a, (ast_nodes.ArrayType, ast_nodes.VectorType)):
+        return same_type(a.inner, b.inner)
+    if isinstance(a, ast_nodes.DictType):
+        return same_type(a.key_type, b.key_type) and same_type(a.value_type, b.value_type)
+    return False
+
+
+def _describe(expr):
+    if isinstance(expr, ast_nodes.IntLiteral):
+        return "Ganzzahl-Literal"
+    if isinstance(expr, ast_nodes.FloatLiteral):
+        return "Fließkomma-Literal"
+    if isinstance(expr, ast_nodes.StringLiteral):
+        return STRING_TYPE
+    if isinstance(expr, ast_nodes.ArrayLiteral):
+        return "Array-Literal"
+    if isinstance(expr, ast_nodes.DictLiteral):
+        return "Wörterbuch-Literal"
+    return type(expr).__name__
@@ -0,0 +1,142 @@
+# ============================
+#   STACK VM
+# ============================
+
+
+import ast_nodes
+from compiler import (
+    APPEND,
+    BUILD_DICT,
+    BUILD_LIST,
+    BUILD_TYPED_ARRAY,
+    CALL_BUILTIN_AUSGEBEN,
+    CALL_FUNCTION,
+    DICT_SET,
+    LOAD_CONST,
+    LOAD_FAST,
+    RAISE,
+    STORE_FAST,
+    compile_program,
+)
+from frozen import FROZEN_TYPES, thaw
+from output import PrintSink
+from resolver import call_depth_message
+from typecheck import SEQUENCE_TYPES, TypedArray
+
+
+class VM:
+    def __init__(self, program: ast_nodes.Program, output=None):
+        self.program = program
+        self.codes = compile_program(program)
+        self.env = []
+        self.output = output if output is not None else PrintSink()
+
+        # Frame-Pool dieser Instanz wie im Evaluator: ein Frame pro
+        # CodeObject, ohne Rekursion ist keines zweimal aktiv
+        self.frames = {id(code): ([None] * code.frame_size, (None,) * code.frame_size) for code in self.codes.values()}
+
+    # -------------------------
+    #   ENTRY POINT
+    # -------------------------
+    def run(self):
+        if "losgehen" not in self.codes:
+            raise Exception("Keine Funktion 'losgehen' gefunden.")
+
+        try:
+            self.execute(self.codes["losgehen"])
+        except RecursionError:
+            raise Exception(call_depth_message()) from None
+
+    # -------------------------
+    #   MAIN LOOP
+    # -------------------------
+    def execute(self, code_obj):
+        env, empty = self.frames[id(code_obj)]
+        old_env = self.env
+        self.env = env
+
+        consts = code_obj.consts
+        slot_names = code_obj.slot_names
+
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        write = self.output.write
+
+        try:
+            # häufigste Opcodes zuerst
+            for op, arg in code_obj.instructions:
+                if op == LOAD_FAST:
+                    push(env[arg])
+
+                elif op == LOAD_CONST:
+                    push(consts[arg])
+
+                elif op == STORE_FAST:
+                    env[arg] = pop()
+
+                elif op == CALL_BUILTIN_AUSGEBEN:
+                    if arg == 1:
+                        write(pop())
+                    else:
+                        args = stack[-arg:]
+                        del stack[-arg:]
+                        write(args[0])
+
+                elif op == BUILD_LIST:
+                    if arg:
+                        items = stack[-arg:]
+                        del stack[-arg:]
+                        push(items)
+                    else:
+                        push([])
+
+                elif op == BUILD_TYPED_ARRAY:
+                    push(TypedArray(consts[arg], pop()))
+
+                elif op == BUILD_DICT:
+                    if arg:
+                        items = stack[-2 * arg :]
+                        del stack[-2 * arg :]
+                        push(dict(zip(items[::2], items[1::2])))
+                    else:
+                        push({})
+
+                elif op == APPEND:
+                    value = pop()
+                    container = env[arg]
+
+                    if not isinstance(container, SEQUENCE_TYPES):
+                        raise Exception(f"Kann nicht zu {slot_names[arg]} hinzufügen: kein Vektor/Array")
+
+                    # geteiltes Literal: erst beim ersten Verändern kopieren
+                    if type(container) in FROZEN_TYPES:
+                        container = env[arg] = thaw(container)
+
+                    container.append(value)
+
+                elif op == DICT_SET:
+                    value = pop()
+                    key = pop()
+                    container = env[arg]
+
+                    if not isinstance(container, dict):
+                        raise Exception(f"Kann keinen Schlüssel in {slot_names[arg]} setzen: kein Wörterbuch")
+
+                    if type(container) in FROZEN_TYPES:
+                        container = env[arg] = thaw(container)
+
+                    container[key] = value
+
+                elif op == CALL_FUNCTION:
+                    self.execute(consts[arg])
+
+                elif op == RAISE:
+                    raise Exception(consts[arg])
+
+                else:
+                    raise Exception(f"Unbekannter Opcode: {op}")
+        finally:
+            # geleert zurück in den Pool, auch nach einer Ausnahme
+            env[:] = empty
+            self.env = old_env